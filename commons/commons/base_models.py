@@ -1,9 +1,11 @@
 import hashlib
 import logging
 from datetime import datetime
-from typing import Generic, TypeVar, Dict
+from typing import ClassVar, Generic, TypeVar, Dict
 
-from pydantic import BaseModel, Field
+import orjson
+import xxhash
+from pydantic import BaseModel, ConfigDict, Field
 
 logger = logging.getLogger(__name__)
 
@@ -12,15 +14,23 @@ U = TypeVar('U')  # Type variable for User ID
 D = TypeVar('D')  # Type variable for Object data
 
 
+def _hash_bytes(b: bytes) -> str:
+    """Hash serialized object bytes"""
+    return xxhash.xxh3_64(b).hexdigest()
+
+
+# Methods compiled by Cython are `cyfunction` objects, which pydantic would
+# otherwise mistake for un-annotated fields
+_FUNCTION_TYPES = (type(_hash_bytes),)
+
+
 class BaseSchema(BaseModel, Generic[I, U]):
     """Base schema class for all models with ID and creation tracking."""
     id: I | None = None
     created_at: datetime | None = Field(default=None, alias="createdAt")
     created_by: U | None = Field(default=None, alias="createdBy")
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
 
 class UpdatableSchema(BaseModel, Generic[I, U]):
@@ -31,9 +41,7 @@ class UpdatableSchema(BaseModel, Generic[I, U]):
     updated_at: datetime | None = Field(default=None, alias="updatedAt")
     updated_by: U | None = Field(default=None, alias="updatedBy")
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = ConfigDict(populate_by_name=True, arbitrary_types_allowed=True)
 
 
 class ObjectWithUniqueID(BaseModel, Generic[D]):
@@ -42,21 +50,41 @@ class ObjectWithUniqueID(BaseModel, Generic[D]):
     object: D
     headers: Dict[str, str] | None = None
 
+    # Set to True to keep producing the legacy MD5-of-str() ETags
+    legacy_md5: ClassVar[bool] = False
+
+    def _serialize_object(self) -> bytes:
+        """Serialize the wrapped object to bytes for hashing"""
+        if isinstance(self.object, BaseModel):
+            # pydantic-core writes JSON bytes in one pass, no str round-trip
+            return self.object.__pydantic_serializer__.to_json(self.object)
+        return orjson.dumps(self.object, default=str, option=orjson.OPT_NON_STR_KEYS)
+
     def get_unique_id(self) -> str:
         """Generate or return the unique ID for the object"""
         if self.unique_id is not None:
             return self.unique_id
 
         try:
-            # Create MD5 hash of the object's string representation
-            md5_hash = hashlib.md5(str(self.object).encode()).hexdigest()
-            self.unique_id = f'"{md5_hash}"'
+            if self.legacy_md5:
+                digest = hashlib.md5(str(self.object).encode()).hexdigest()
+            else:
+                # The ID is only used as a cache/ETag key, so a fast
+                # non-cryptographic hash is sufficient
+                digest = _hash_bytes(self._serialize_object())
+            self.unique_id = f'"{digest}"'
         except Exception as ex:
             logger.error(f"Error while generating unique id for object: {str(self.object)[:500]}", exc_info=ex)
-            self.unique_id = f'"{hash(str(self.object)):x}"'
+            # Builtin hash() is salted per process; use a deterministic digest instead
+            fallback = hashlib.blake2b(
+                str(self.object).encode(), digest_size=8, key=b"j13n"
+            ).hexdigest()
+            self.unique_id = f'"{fallback}"'
 
         return self.unique_id
 
-    class Config:
-        populate_by_name = True
-        arbitrary_types_allowed = True
+    model_config = ConfigDict(
+        populate_by_name=True,
+        arbitrary_types_allowed=True,
+        ignored_types=_FUNCTION_TYPES
+    )
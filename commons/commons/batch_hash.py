@@ -0,0 +1,72 @@
+import hashlib
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List
+
+from .base_models import ObjectWithUniqueID, _hash_bytes
+
+logger = logging.getLogger(__name__)
+
+# hashlib releases the GIL while digesting large buffers, so independent
+# buffers spread over a few threads are hashed on parallel lanes
+_HASH_LANES = 8
+_executor = ThreadPoolExecutor(max_workers=_HASH_LANES, thread_name_prefix="batch-hash")
+
+# Below these sizes dispatching to the pool costs more than it saves
+_PARALLEL_MIN_BYTES = 64 * 1024
+_PARALLEL_MIN_BUFFERS = 4
+
+
+def _md5_hex(buf: bytes) -> str:
+    return hashlib.md5(buf).hexdigest()
+
+
+def md5_multi(buffers: List[bytes]) -> List[str]:
+    """Compute the MD5 hex digest of many independent buffers, preserving order"""
+    if (
+        len(buffers) < _PARALLEL_MIN_BUFFERS
+        or sum(map(len, buffers)) < _PARALLEL_MIN_BYTES
+    ):
+        return [_md5_hex(buf) for buf in buffers]
+    return list(_executor.map(_md5_hex, buffers))
+
+
+def compute_unique_ids(objs: Iterable[ObjectWithUniqueID]) -> List[str]:
+    """
+    Generate unique IDs for a batch of objects in one pass
+
+    Objects that already carry a unique ID are left untouched. Objects whose
+    payload cannot be serialized fall back to ObjectWithUniqueID.get_unique_id.
+
+    Args:
+        objs: Objects to identify
+
+    Returns:
+        The unique IDs, in the same order as the input objects
+    """
+    objs = list(objs)
+    md5_pending, md5_payloads = [], []
+    xxh_pending, xxh_payloads = [], []
+    for obj in objs:
+        if obj.unique_id is not None:
+            continue
+        try:
+            if obj.legacy_md5:
+                md5_payloads.append(str(obj.object).encode())
+                md5_pending.append(obj)
+            else:
+                xxh_payloads.append(obj._serialize_object())
+                xxh_pending.append(obj)
+        except Exception as ex:
+            logger.warning(
+                "Could not serialize object for batch hashing: "
+                f"{str(obj.object)[:500]}",
+                exc_info=ex
+            )
+
+    digests = md5_multi(md5_payloads)
+    digests += [_hash_bytes(payload) for payload in xxh_payloads]
+    for obj, digest in zip(md5_pending + xxh_pending, digests):
+        obj.unique_id = f'"{digest}"'
+
+    return [obj.get_unique_id() for obj in objs]
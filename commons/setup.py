@@ -0,0 +1,14 @@
+from setuptools import setup
+
+try:
+    from Cython.Build import cythonize
+except ImportError:
+    # Without Cython the pure-Python modules are installed as-is
+    ext_modules = []
+else:
+    ext_modules = cythonize(
+        ["commons/base_models.py"],
+        language_level=3,
+    )
+
+setup(ext_modules=ext_modules)
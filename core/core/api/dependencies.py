@@ -0,0 +1,17 @@
+from fastapi import Request
+
+from ..services.document_service import DocumentService
+from ..services.job_application_service import JobAnalysisService
+from ..services.job_search_service import JobSearchService
+
+# Services are created once in the app lifespan (see main.py); these
+# providers are shared by every router instead of being redefined per module.
+
+async def get_document_service(request: Request) -> DocumentService:
+    return request.app.state.document_service
+
+async def get_job_search_service(request: Request) -> JobSearchService:
+    return request.app.state.job_search_service
+
+async def get_job_application_service(request: Request) -> JobAnalysisService:
+    return request.app.state.job_application_service
@@ -1,56 +1,51 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks
-from typing import AsyncGenerator, Dict, Any, Optional, List
+from fastapi import (
+    APIRouter, HTTPException, Depends, BackgroundTasks, Request, Response
+)
+from typing import Dict, Optional
 from ..services.document_service import DocumentService
-from ..config.settings import get_settings
-from fastapi.responses import JSONResponse
+from .dependencies import get_document_service
+from pydantic import TypeAdapter
 from ..models.document_models import DocumentType, DocumentInfo, DocumentListResponse
-import asyncio
+from .responses import adapted_response
+from .routing import ORJSONRoute
 
-router = APIRouter(prefix="/documents", tags=["documents"])
-settings = get_settings()
+router = APIRouter(prefix="/documents", tags=["documents"], route_class=ORJSONRoute)
 
-async def get_document_service() -> AsyncGenerator[DocumentService, None]:
-    service = None
-    try:
-        service = DocumentService()
-        yield service
-    finally:
-        if service:
-            await service.cleanup()
+_ALLOWED_UPLOAD_TYPES = frozenset({
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "text/plain"
+})
+
+_DOCUMENT_INFO_ADAPTER = TypeAdapter(DocumentInfo)
+_DOCUMENT_LIST_ADAPTER = TypeAdapter(DocumentListResponse)
 
 @router.post("/upload/{document_type}", response_model=DocumentInfo)
 async def upload_document(
     document_type: DocumentType,
-    file: UploadFile = File(...),
-    background_tasks: BackgroundTasks = None,
+    request: Request,
+    filename: str,
     service: DocumentService = Depends(get_document_service)
-) -> DocumentInfo:
+) -> Response:
     """
-    Upload a document (resume or cover letter) with optimized handling
+    Upload a document (resume or cover letter) sent as the raw request body.
+    The body is streamed straight to disk instead of being spooled by UploadFile.
     """
     try:
         # Validate content type
-        allowed_types = {
-            "application/pdf",
-            "application/msword",
-            "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-            "text/plain"
-        }
-
-        if file.content_type not in allowed_types:
+        content_type = request.headers.get("content-type", "").split(";")[0].strip()
+        if content_type not in _ALLOWED_UPLOAD_TYPES:
             raise HTTPException(
                 status_code=400,
                 detail="Invalid file type. Allowed types: PDF, DOC, DOCX, TXT"
             )
 
         # Process upload
-        result = await service.save_document(file, document_type)
-
-        # Add cleanup task
-        if background_tasks:
-            background_tasks.add_task(file.close)
-
-        return result
+        result = await service.save_document_stream(
+            request.stream(), content_type, document_type, filename
+        )
+        return adapted_response(_DOCUMENT_INFO_ADAPTER, result)
     except ValueError as e:
         raise HTTPException(
             status_code=400,
@@ -66,12 +61,13 @@ async def upload_document(
 async def list_documents(
     document_type: Optional[DocumentType] = None,
     service: DocumentService = Depends(get_document_service)
-) -> DocumentListResponse:
+) -> Response:
     """
     List all documents with optional filtering by type
     """
     try:
-        return await service.list_documents(document_type)
+        result = await service.list_documents(document_type)
+        return adapted_response(_DOCUMENT_LIST_ADAPTER, result)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -82,7 +78,7 @@ async def list_documents(
 async def get_document(
     filename: str,
     service: DocumentService = Depends(get_document_service)
-) -> DocumentInfo:
+) -> Response:
     """
     Get document information
     """
@@ -93,7 +89,7 @@ async def get_document(
                 status_code=404,
                 detail="Document not found"
             )
-        return result
+        return adapted_response(_DOCUMENT_INFO_ADAPTER, result)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -1,7 +1,10 @@
-from fastapi import APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks
-from typing import List, AsyncGenerator, Dict, Any, Optional
+from fastapi import (
+    APIRouter, HTTPException, Depends, UploadFile, File, BackgroundTasks, Response
+)
+from typing import Dict, Any, Optional
+from pydantic import TypeAdapter
 from ..models.job_models import JobSearchRequest, JobResult, JobSearchResponse
-from ..models.document_models import DocumentType, DocumentInfo
+from ..models.document_models import DocumentType
 from ..models.application_models import (
     ApplicationRequest,
     ApplicationResponse,
@@ -10,39 +13,19 @@ from ..models.application_models import (
     ApplicationUpdateRequest
 )
 from ..services.job_search_service import JobSearchService
-from ..services.job_application_service import JobApplicationService
+from ..services.job_application_service import JobAnalysisService
 from ..services.document_service import DocumentService
-from ..config.settings import get_settings
-
-router = APIRouter(prefix="/jobs", tags=["jobs"])
-settings = get_settings()
-
-async def get_job_search_service() -> AsyncGenerator[JobSearchService, None]:
-    service = None
-    try:
-        service = JobSearchService()
-        yield service
-    finally:
-        if service:
-            await service.cleanup()
+from .dependencies import (
+    get_document_service, get_job_search_service, get_job_application_service
+)
+from .responses import adapted_response
+from .routing import ORJSONRoute
+import asyncio
 
-async def get_job_application_service() -> AsyncGenerator[JobApplicationService, None]:
-    service = None
-    try:
-        service = JobApplicationService()
-        yield service
-    finally:
-        if service:
-            await service.cleanup()
+router = APIRouter(prefix="/jobs", tags=["jobs"], route_class=ORJSONRoute)
 
-async def get_document_service() -> AsyncGenerator[DocumentService, None]:
-    service = None
-    try:
-        service = DocumentService()
-        yield service
-    finally:
-        if service:
-            await service.cleanup()
+_JOB_SEARCH_ADAPTER = TypeAdapter(JobSearchResponse)
+_APPLICATION_ADAPTER = TypeAdapter(ApplicationResponse)
 
 async def validate_search_request(request: JobSearchRequest) -> JobSearchRequest:
     if not request.query.strip():
@@ -53,14 +36,11 @@ async def validate_search_request(request: JobSearchRequest) -> JobSearchRequest
 async def search_jobs(
     request: JobSearchRequest = Depends(validate_search_request),
     service: JobSearchService = Depends(get_job_search_service)
-):
+) -> Response:
     try:
+        # The service already returns a fully built JobSearchResponse
         results = await service.search_jobs(request)
-        return JobSearchResponse(
-            results=results,
-            total_results=len(results),
-            search_query=request.query
-        )
+        return adapted_response(_JOB_SEARCH_ADAPTER, results)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -70,7 +50,7 @@ async def search_jobs(
 @router.post("/apply", response_model=Dict[str, Any])
 async def process_job_application(
     job: JobResult,
-    service: JobApplicationService = Depends(get_job_application_service)
+    service: JobAnalysisService = Depends(get_job_application_service)
 ):
     try:
         result = await service.process_job_application(job)
@@ -85,7 +65,7 @@ async def process_job_application(
 async def search_and_apply(
     request: JobSearchRequest = Depends(validate_search_request),
     search_service: JobSearchService = Depends(get_job_search_service),
-    application_service: JobApplicationService = Depends(get_job_application_service)
+    application_service: JobAnalysisService = Depends(get_job_application_service)
 ):
     try:
         # First search for jobs
@@ -117,9 +97,9 @@ async def apply_with_url(
     resume: Optional[UploadFile] = File(None),
     cover_letter: Optional[UploadFile] = File(None),
     background_tasks: BackgroundTasks = None,
-    job_service: JobApplicationService = Depends(get_job_application_service),
+    job_service: JobAnalysisService = Depends(get_job_application_service),
     document_service: DocumentService = Depends(get_document_service)
-) -> ApplicationResponse:
+) -> Response:
     """
     Apply for a job using a URL and optional documents
     """
@@ -132,22 +112,28 @@ async def apply_with_url(
             company=""
         )
 
-        # Process documents if provided
-        documents = {}
-        if resume:
-            resume_info = await document_service.save_document(resume, DocumentType.RESUME)
-            documents["resume"] = resume_info
-            if background_tasks:
-                background_tasks.add_task(resume.close)
+        # Process documents if provided; the saves are independent, so run them together
+        uploads = {
+            key: (upload, document_type)
+            for key, upload, document_type in (
+                ("resume", resume, DocumentType.RESUME),
+                ("cover_letter", cover_letter, DocumentType.COVER_LETTER)
+            )
+            if upload
+        }
+        saved = await asyncio.gather(*(
+            document_service.save_document(upload, document_type)
+            for upload, document_type in uploads.values()
+        ))
+        documents = dict(zip(uploads, saved))
 
-        if cover_letter:
-            cover_letter_info = await document_service.save_document(cover_letter, DocumentType.COVER_LETTER)
-            documents["cover_letter"] = cover_letter_info
-            if background_tasks:
-                background_tasks.add_task(cover_letter.close)
+        if background_tasks:
+            for upload, _ in uploads.values():
+                background_tasks.add_task(upload.close)
 
         # Process the job application
-        return await job_service.process_job_application(job, documents)
+        result = await job_service.process_job_application(job, documents)
+        return adapted_response(_APPLICATION_ADAPTER, result)
     except Exception as e:
         raise HTTPException(
             status_code=500,
@@ -159,7 +145,7 @@ async def list_applications(
     status: Optional[ApplicationStatus] = None,
     page: int = 1,
     page_size: int = 10,
-    job_service: JobApplicationService = Depends(get_job_application_service)
+    job_service: JobAnalysisService = Depends(get_job_application_service)
 ) -> ApplicationListResponse:
     """
     List all job applications with optional filtering
@@ -185,7 +171,7 @@ async def list_applications(
 async def update_application(
     application_id: str,
     update: ApplicationUpdateRequest,
-    job_service: JobApplicationService = Depends(get_job_application_service)
+    job_service: JobAnalysisService = Depends(get_job_application_service)
 ) -> ApplicationResponse:
     """
     Update an existing job application
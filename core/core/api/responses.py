@@ -0,0 +1,23 @@
+from typing import Any
+
+from fastapi import Response
+from pydantic import TypeAdapter
+
+
+def adapted_response(adapter: TypeAdapter, content: Any) -> Response:
+    """
+    Serialize a response with a precompiled TypeAdapter.
+
+    Returning a Response instance makes FastAPI skip its own response_model
+    validation and encoding, so the payload is dumped exactly once by
+    pydantic-core, straight to JSON bytes. Routes keep response_model only
+    for the OpenAPI schema.
+
+    Args:
+        adapter: TypeAdapter built once at module import for the response type
+        content: The response model instance
+
+    Returns:
+        Response with the JSON body
+    """
+    return Response(adapter.dump_json(content), media_type="application/json")
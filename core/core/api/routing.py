@@ -0,0 +1,28 @@
+from typing import Any, Callable
+
+import orjson
+from fastapi import Request, Response
+from fastapi.routing import APIRoute
+
+
+class ORJSONRequest(Request):
+    """Request that decodes JSON bodies with orjson instead of the stdlib"""
+
+    async def json(self) -> Any:
+        if not hasattr(self, "_json"):
+            # orjson parses bytes directly, without decoding to str first
+            self._json = orjson.loads(await self.body())
+        return self._json
+
+
+class ORJSONRoute(APIRoute):
+    """Route class that hands handlers an ORJSONRequest"""
+
+    def get_route_handler(self) -> Callable:
+        original_route_handler = super().get_route_handler()
+
+        async def route_handler(request: Request) -> Response:
+            orjson_request = ORJSONRequest(request.scope, request.receive)
+            return await original_route_handler(orjson_request)
+
+        return route_handler
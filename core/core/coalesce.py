@@ -0,0 +1,48 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Hashable, TypeVar
+
+T = TypeVar('T')
+
+
+async def coalesced(
+    inflight: Dict[Hashable, asyncio.Future],
+    key: Hashable,
+    run: Callable[[], Awaitable[T]]
+) -> T:
+    """
+    Await `run()`, or share the result of an identical call already in flight
+
+    Callers passing the same `inflight` dict and `key` while a call is running
+    wait on it instead of starting their own, and get its result or exception.
+
+    Args:
+        inflight: Futures of the calls currently running, by key
+        key: Identifies calls that can share a result
+        run: Starts the call when none is in flight for `key`
+    """
+    while True:
+        pending = inflight.get(key)
+        if pending is None:
+            break
+        # Shielded so a cancelled waiter does not cancel the shared future
+        result = await asyncio.shield(pending)
+        if result is not None:
+            return result
+
+    future = asyncio.get_running_loop().create_future()
+    inflight[key] = future
+    try:
+        result = await run()
+        future.set_result(result)
+        return result
+    except Exception as e:
+        # Waiters fail with this call instead of each retrying it in turn
+        future.set_exception(e)
+        # Retrieved here so asyncio doesn't warn when no one was waiting
+        future.exception()
+        raise
+    finally:
+        # An abandoned call leaves waiters to make their own
+        if not future.done():
+            future.set_result(None)
+        del inflight[key]
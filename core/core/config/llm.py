@@ -0,0 +1,35 @@
+from functools import lru_cache
+from typing import Optional
+
+from langchain.chat_models import ChatOpenAI
+from openai import AsyncOpenAI
+
+from .settings import get_settings
+
+# Shared across all services so connections to the OpenAI API are pooled and reused
+_openai_client: Optional[AsyncOpenAI] = None
+
+
+def get_openai_client() -> AsyncOpenAI:
+    """Return the shared OpenAI client, creating it on first use"""
+    global _openai_client
+    if _openai_client is None or _openai_client.is_closed():
+        _openai_client = AsyncOpenAI(api_key=get_settings().OPENAI_API_KEY)
+    return _openai_client
+
+
+async def close_openai_client() -> None:
+    """Close the shared OpenAI client; call once at application shutdown"""
+    global _openai_client
+    if _openai_client is not None and not _openai_client.is_closed():
+        await _openai_client.close()
+    _openai_client = None
+
+
+@lru_cache(maxsize=None)
+def get_chat_model(model: str, temperature: float = 0) -> ChatOpenAI:
+    """Return the process-wide LangChain chat model for a model/temperature pair"""
+    return ChatOpenAI(
+        model=model,
+        temperature=temperature
+    )
@@ -1,5 +1,5 @@
 from pydantic_settings import BaseSettings
-from functools import lru_cache
+from functools import cache
 import os
 from dotenv import load_dotenv
 
@@ -13,6 +13,10 @@ class Settings(BaseSettings):
     GOOGLE_API_KEY: str = os.getenv("GOOGLE_API_KEY", "")
     GOOGLE_CSE_ID: str = os.getenv("GOOGLE_CSE_ID", "")
     API_PREFIX: str = "/api/v1"
+    # Worker threads for blocking calls (search API clients, file magic, parsing)
+    THREAD_POOL_SIZE: int = 64
+    # Concurrent OpenAI completions per service, to stay inside rate limits
+    MAX_CONCURRENT_LLM: int = 8
 
     # Property aliases for consistent naming
     @property
@@ -30,6 +34,6 @@ class Settings(BaseSettings):
     class Config:
         env_file = ".env"
 
-@lru_cache()
+@cache
 def get_settings() -> Settings:
     return Settings()
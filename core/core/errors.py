@@ -0,0 +1,30 @@
+import functools
+from typing import Any, Awaitable, Callable, Type, TypeVar
+
+T = TypeVar('T')
+
+
+def wrap_errors(
+    message: str,
+    error_class: Type[Exception] = Exception
+) -> Callable[[Callable[..., Awaitable[T]]], Callable[..., Awaitable[T]]]:
+    """
+    Re-raise any exception from the decorated coroutine function as
+    `error_class(f"{message}: {e}")`, chained to the original
+
+    The original exception stays available as `__cause__`, so callers and
+    tracebacks can still see what actually failed.
+
+    Args:
+        message: Prefix describing the operation that failed
+        error_class: Exception type to raise
+    """
+    def decorator(func: Callable[..., Awaitable[T]]) -> Callable[..., Awaitable[T]]:
+        @functools.wraps(func)
+        async def wrapper(*args: Any, **kwargs: Any) -> T:
+            try:
+                return await func(*args, **kwargs)
+            except Exception as e:
+                raise error_class(f"{message}: {str(e)}") from e
+        return wrapper
+    return decorator
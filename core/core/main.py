@@ -1,22 +1,48 @@
 from fastapi import FastAPI
+from fastapi.responses import ORJSONResponse
 from .api.job_routes import router as job_router
 from .api.document_routes import router as document_router
 from .config.settings import get_settings
+from .config.llm import close_openai_client
+from .scraping.base import get_http_session, close_http_session, shutdown_parse_pool
+from .services.document_service import DocumentService
+from .services.job_search_service import JobSearchService
+from .services.job_application_service import JobAnalysisService
 import uvicorn
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
 from contextlib import asynccontextmanager
 
 settings = get_settings()
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
-    # Startup
+    # Startup: one sized pool backs every to_thread/run_in_executor call in the app
+    executor = ThreadPoolExecutor(
+        max_workers=settings.THREAD_POOL_SIZE, thread_name_prefix="worker"
+    )
+    asyncio.get_running_loop().set_default_executor(executor)
+
+    # Services live for the whole app instead of being rebuilt per request
+    get_http_session()
+    app.state.document_service = DocumentService()
+    app.state.job_search_service = JobSearchService()
+    app.state.job_application_service = JobAnalysisService()
     yield
     # Shutdown
+    await app.state.job_application_service.cleanup()
+    await app.state.job_search_service.cleanup()
+    await app.state.document_service.cleanup()
+    await close_http_session()
+    await close_openai_client()
+    shutdown_parse_pool()
+    executor.shutdown(wait=False)
 
 app = FastAPI(
     title=settings.APP_NAME,
     debug=settings.DEBUG,
-    lifespan=lifespan
+    lifespan=lifespan,
+    default_response_class=ORJSONResponse
 )
 
 # Include routers
@@ -1,6 +1,17 @@
-from typing import Dict, Any
+from typing import Dict, Any, List
 from pydantic import BaseModel, HttpUrl
 
+class FormField(BaseModel):
+    required: bool  # Whether the field is mandatory
+    field_type: str  # Type of input needed (text, number, date, select, etc.)
+    description: str  # What should go in this field
+
+class FormFields(BaseModel):
+    fields: Dict[str, FormField]  # Keyed by form field name
+
+class FormFieldsBatch(BaseModel):
+    postings: List[FormFields]  # One entry per posting, in the order they were given
+
 class JobAnalysis(BaseModel):
     url: HttpUrl
     form_fields: Dict[str, Any]  # Dynamic form fields from the job posting
@@ -1,29 +1,44 @@
 from typing import Dict, Any
-from bs4 import BeautifulSoup
+from selectolax.lexbor import LexborHTMLParser
 from .base import BaseScrapingService
+from ..errors import wrap_errors
+
+def _parse_form_fields(html: str) -> Dict[str, Any]:
+    """Extract form fields from page HTML; module-level to run in the parsing pool"""
+    tree = LexborHTMLParser(html)
+    form_fields = {}
+
+    # Find all form elements in a single selector pass
+    for field in tree.css('form input, form select, form textarea'):
+        attrs = field.attributes
+        field_name = attrs.get('name') or attrs.get('id')
+        if field_name:
+            form_fields[field_name] = {
+                "type": attrs.get('type') or 'text',
+                "required": 'required' in attrs,
+                "placeholder": attrs.get('placeholder') or '',
+                "options": (
+                    [opt.attributes.get('value') for opt in field.css('option')]
+                    if field.tag == 'select' else None
+                )
+            }
+    return form_fields
 
 class FormScrapingService(BaseScrapingService):
+    @wrap_errors("Error scraping form fields")
     async def scrape(self, url: str) -> Dict[str, Any]:
         """Scrape form fields from a page"""
-        try:
-            soup = await self.get_soup(url)
-            form_fields = {}
+        return await self._page_form_fields(url, await self.get_html(url))
 
-            # Find all form elements
-            for form in soup.find_all('form'):
-                for field in form.find_all(['input', 'select', 'textarea']):
-                    field_name = field.get('name') or field.get('id')
-                    if field_name:
-                        form_fields[field_name] = {
-                            "type": field.get('type', 'text'),
-                            "required": field.get('required', False),
-                            "placeholder": field.get('placeholder', ''),
-                            "options": [opt.get('value') for opt in field.find_all('option')] if field.name == 'select' else None
-                        }
+    @wrap_errors("Error scraping form fields")
+    async def scrape_page(self, url: str, html: str) -> Dict[str, Any]:
+        """Scrape form fields from a page the caller already downloaded"""
+        return await self._page_form_fields(url, html)
 
-            return {
-                "url": url,
-                "form_fields": form_fields
-            }
-        except Exception as e:
-            raise Exception(f"Error scraping form fields: {str(e)}")
\ No newline at end of file
+    async def _page_form_fields(self, url: str, html: str) -> Dict[str, Any]:
+        form_fields = await self.parse(_parse_form_fields, html)
+
+        return {
+            "url": url,
+            "form_fields": form_fields
+        }
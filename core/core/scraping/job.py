@@ -1,8 +1,33 @@
 from typing import Dict, Any, Optional, Tuple
-from bs4 import BeautifulSoup
-import requests
+from selectolax.lexbor import LexborHTMLParser
 from urllib.parse import urlparse, urljoin
 from .base import BaseScrapingService
+from ..errors import wrap_errors
+
+_DETAIL_FIELDS = ('title', 'company', 'content')
+
+
+def _compile_board_query(
+    patterns: Dict[str, str]
+) -> Tuple[str, Tuple[Tuple[str, str], ...]]:
+    """
+    Fuse a job board's field selectors into one CSS group selector.
+
+    All board selectors are single class selectors, so each matched node can
+    be attributed back to its field by class name. This lets get_job_details
+    walk the tree once instead of once per field.
+    """
+    fields = []
+    for field in _DETAIL_FIELDS:
+        selector = patterns[f'{field}_selector']
+        if selector:
+            fields.append((field, selector.lstrip('.')))
+    return ', '.join(f'.{class_name}' for _, class_name in fields), tuple(fields)
+
+def _registered_domain(url: str) -> str:
+    """Reduce a URL to its last two host labels: 'uk.linkedin.com' -> 'linkedin.com'"""
+    host = urlparse(url).hostname or ''
+    return '.'.join(host.split('.')[-2:])
 
 class JobScrappingService(BaseScrapingService):
     # Common job board domains and their job posting URL patterns
@@ -27,114 +52,154 @@ class JobScrappingService(BaseScrapingService):
         }
     }
 
-    async def validate_job_url(self, url: str) -> Tuple[bool, Optional[str]]:
-        """Validate if URL is a job posting and get the actual job posting URL"""
-        try:
-            # Follow redirects to get the final URL
-            response = requests.get(url, allow_redirects=True)
-            final_url = response.url
+    # Common job posting indicators, matched against one lowercased copy of the page
+    JOB_INDICATORS = (
+        'job', 'career', 'position', 'vacancy', 'opening',
+        'apply', 'application', 'requirements', 'qualifications'
+    )
+
+    # Indicators show up in the title, headings and navigation, so only the top of
+    # the page is scanned
+    INDICATOR_SCAN_CHARS = 128 * 1024
+
+    # Case-insensitive class substring matches for pages on unknown job boards,
+    # evaluated by Lexbor instead of a Python filter over every div/span
+    GENERIC_COMPANY_SELECTOR = ', '.join(
+        f'{tag}[class*="{word}" i]'
+        for tag in ('div', 'span')
+        for word in ('company', 'employer', 'organization')
+    )
+    GENERIC_CONTENT_SELECTOR = ', '.join(
+        f'div[class*="{word}" i]' for word in ('content', 'main', 'body')
+    )
+
+    # Upper bound on page text returned when no content selector matched
+    FALLBACK_CONTENT_CHARS = 32 * 1024
+
+    # Fused detail selectors per job board, built once at class load
+    BOARD_QUERIES = {
+        job_board: _compile_board_query(patterns)
+        for job_board, patterns in JOB_BOARDS.items()
+    }
 
-            # Parse the URL
-            parsed_url = urlparse(final_url)
-            domain = parsed_url.netloc.lower()
+    @wrap_errors("Error validating job URL")
+    async def validate_job_url(
+        self, url: str
+    ) -> Tuple[bool, Optional[str], Optional[str]]:
+        """
+        Validate if URL is a job posting and get the actual job posting URL
+
+        The page HTML downloaded for validation is returned alongside the URL
+        so callers can parse it without fetching the page a second time.
+        """
+        # Follow redirects to get the final URL
+        final_url, html = await self.fetch(url)
+        if self.is_job_page(final_url, html):
+            return True, final_url, html
+        return False, None, None
+
+    def is_job_page(self, url: str, html: str) -> bool:
+        """Check whether a downloaded page at its final URL looks like a job posting"""
+        # Check if it's a known job board
+        patterns = self.JOB_BOARDS.get(_registered_domain(url))
+        if patterns:
+            # Check if it matches the job posting pattern
+            if patterns['job_pattern'] in url:
+                return True
+
+        # If not a known job board, try to detect if it's a job posting.
+        # Only visible text counts: markup, CSS and scripts ("application/json",
+        # "position:") would match almost any page
+        tree = LexborHTMLParser(html[:self.INDICATOR_SCAN_CHARS])
+        tree.strip_tags(['script', 'style', 'noscript'])
+        page_text = tree.root.text(separator=' ').lower() if tree.root else ''
+        return any(indicator in page_text for indicator in self.JOB_INDICATORS)
+
+    async def get_job_details(self, url: str, tree: LexborHTMLParser) -> Dict[str, str]:
+        """Extract job details from the page"""
+        return _job_details(url, tree)
 
-            # Check if it's a known job board
-            for job_board, patterns in self.JOB_BOARDS.items():
-                if job_board in domain:
-                    # Check if it matches the job posting pattern
-                    if patterns['job_pattern'] in final_url:
-                        return True, final_url
+    @wrap_errors("Error scraping job posting")
+    async def scrape(self, url: str) -> Dict[str, Any]:
+        """Scrape job posting content"""
+        # First validate if it's a job posting
+        is_job, final_url, html = await self.validate_job_url(url)
+        if not is_job:
+            raise Exception("URL does not appear to be a job posting")
+
+        # Parse the page already downloaded during validation
+        return await self._page_details(final_url, html)
+
+    @wrap_errors("Error scraping job posting")
+    async def scrape_page(self, url: str, html: str) -> Dict[str, Any]:
+        """Scrape job posting content from a page the caller already downloaded"""
+        if not self.is_job_page(url, html):
+            raise Exception("URL does not appear to be a job posting")
+        return await self._page_details(url, html)
+
+    async def _page_details(self, final_url: str, html: str) -> Dict[str, Any]:
+        job_details = await self.parse(_parse_job_page, html, final_url)
+
+        return {
+            "url": final_url,
+            "is_job_posting": True,
+            **job_details
+        }
 
-            # If not a known job board, try to detect if it's a job posting
-            soup = BeautifulSoup(response.text, 'html.parser')
 
-            # Common job posting indicators
-            job_indicators = [
-                'job', 'career', 'position', 'vacancy', 'opening',
-                'apply', 'application', 'requirements', 'qualifications'
-            ]
+def _job_details(url: str, tree: LexborHTMLParser) -> Dict[str, str]:
+    """Extract job details from a parsed page"""
+    # Try to get selectors for known job boards
+    board_query = JobScrappingService.BOARD_QUERIES.get(_registered_domain(url))
+
+    details = {}
+    if board_query:
+        # Extract using known selectors, keeping the first match per field
+        selector, fields = board_query
+        for node in tree.css(selector) if selector else ():
+            node_classes = (node.attributes.get('class') or '').split()
+            for field, class_name in fields:
+                if field not in details and class_name in node_classes:
+                    details[field] = node.text(strip=True)
+    else:
+        # Generic extraction for unknown job boards
+        # Look for common job posting elements
+        title_candidates = tree.css('h1, h2, h3')
+        for title in title_candidates:
+            title_text = title.text().lower()
+            if any(keyword in title_text for keyword in ['job', 'position', 'career']):
+                details['title'] = title.text(strip=True)
+                break
 
-            text_content = soup.get_text().lower()
-            if any(indicator in text_content for indicator in job_indicators):
-                return True, final_url
+        # Try to find company name
+        company = tree.css_first(JobScrappingService.GENERIC_COMPANY_SELECTOR)
+        if company:
+            details['company'] = company.text(strip=True)
 
-            return False, None
+        # Get main content
+        main_content = (
+            tree.css_first('main')
+            or tree.css_first('article')
+            or tree.css_first(JobScrappingService.GENERIC_CONTENT_SELECTOR)
+        )
+        if main_content:
+            details['content'] = main_content.text(strip=True)
 
-        except Exception as e:
-            raise Exception(f"Error validating job URL: {str(e)}")
+    return details
 
-    async def get_job_details(self, url: str, soup: BeautifulSoup) -> Dict[str, str]:
-        """Extract job details from the page"""
-        parsed_url = urlparse(url)
-        domain = parsed_url.netloc.lower()
-
-        # Try to get selectors for known job boards
-        selectors = None
-        for job_board, patterns in self.JOB_BOARDS.items():
-            if job_board in domain:
-                selectors = patterns
-                break
 
-        details = {}
-        if selectors:
-            # Extract using known selectors
-            if selectors['title_selector']:
-                title_elem = soup.select_one(selectors['title_selector'])
-                if title_elem:
-                    details['title'] = title_elem.get_text(strip=True)
-
-            if selectors['company_selector']:
-                company_elem = soup.select_one(selectors['company_selector'])
-                if company_elem:
-                    details['company'] = company_elem.get_text(strip=True)
-
-            if selectors['content_selector']:
-                content_elem = soup.select_one(selectors['content_selector'])
-                if content_elem:
-                    details['content'] = content_elem.get_text(strip=True)
-        else:
-            # Generic extraction for unknown job boards
-            # Look for common job posting elements
-            title_candidates = soup.find_all(['h1', 'h2', 'h3'])
-            for title in title_candidates:
-                if any(keyword in title.get_text().lower() for keyword in ['job', 'position', 'career']):
-                    details['title'] = title.get_text(strip=True)
-                    break
-
-            # Try to find company name
-            company_candidates = soup.find_all(['div', 'span'], class_=lambda x: x and any(word in str(x).lower() for word in ['company', 'employer', 'organization']))
-            if company_candidates:
-                details['company'] = company_candidates[0].get_text(strip=True)
-
-            # Get main content
-            main_content = soup.find('main') or soup.find('article') or soup.find('div', class_=lambda x: x and any(word in str(x).lower() for word in ['content', 'main', 'body']))
-            if main_content:
-                details['content'] = main_content.get_text(strip=True)
-
-        return details
+def _parse_job_page(html: str, url: str) -> Dict[str, str]:
+    """Parse a job page into its details; module-level to run in the parsing pool"""
+    tree = LexborHTMLParser(html)
 
-    async def scrape(self, url: str) -> Dict[str, Any]:
-        """Scrape job posting content"""
-        try:
-            # First validate if it's a job posting
-            is_job, final_url = await self.validate_job_url(url)
-            if not is_job:
-                raise Exception("URL does not appear to be a job posting")
-
-            # Get the page content
-            soup = await self.get_soup(final_url)
-
-            # Extract job details
-            job_details = await self.get_job_details(final_url, soup)
-
-            if not job_details.get('content'):
-                # Fallback to basic content extraction if specific selectors didn't work
-                job_details['content'] = soup.get_text(separator='\n', strip=True)
-
-            return {
-                "url": final_url,
-                "is_job_posting": True,
-                **job_details
-            }
-        except Exception as e:
-            raise Exception(f"Error scraping job posting: {str(e)}")
\ No newline at end of file
+    # Extract job details
+    job_details = _job_details(url, tree)
+
+    if not job_details.get('content'):
+        # Fallback to basic content extraction if specific selectors didn't work.
+        # Drop non-visible text first and keep only the leading part of the page
+        tree.strip_tags(['script', 'style', 'noscript'])
+        body_text = tree.body.text(separator='\n', strip=True) if tree.body else ''
+        job_details['content'] = body_text[:JobScrappingService.FALLBACK_CONTENT_CHARS]
+
+    return job_details
@@ -1,11 +1,41 @@
 from abc import abstractmethod
+import asyncio
+import hashlib
+from collections import OrderedDict
 from typing import List, Optional, Dict, Any
+import orjson
 from pydantic import BaseModel
 from langchain.chat_models import ChatOpenAI
 from langchain.prompts import ChatPromptTemplate
 
+from ...config.llm import get_chat_model
 from .search_service import BaseSearchService, SearchRequest, SearchResult
 
+try:
+    # RE2 matches in linear time, so URL patterns cannot backtrack
+    import re2 as _regex
+except ImportError:
+    import re as _regex
+
+
+def compile_pattern(pattern: str):
+    """Compile a case-insensitive pattern with RE2 when available, falling back to re"""
+    # Inline flag, since the re2 module doesn't export re's flag constants
+    return _regex.compile(f'(?i){pattern}')
+
+
+# Patterns that suggest a URL points at a job application. Only a yes/no answer
+# is needed, so they are fused into one alternation and the URL is scanned once
+APPLICATION_URL_RE = compile_pattern('|'.join([
+    r'apply', r'application', r'job', r'career', r'position',
+    r'greenhouse\.io', r'lever\.co', r'workday\.com', r'taleo\.net',
+    r'linkedin\.com\/jobs', r'indeed\.com\/viewjob', r'glassdoor\.com\/job'
+]))
+
+
+# Most distinct optimized queries kept per provider; least recently used go first
+QUERY_CACHE_SIZE = 256
+
 
 class JobSearchResult(SearchResult):
     """Extended search result specifically for job listings"""
@@ -31,12 +61,7 @@ class JobSearchRequest(SearchRequest):
     posted_within: Optional[str] = None  # e.g., "24h", "7d", "30d"
 
 
-def _get_query_optimization_prompt() -> ChatPromptTemplate:
-    """Get the prompt template for query optimization.
-    Can be overridden by specific providers to customize the prompt.
-    """
-    return ChatPromptTemplate.from_messages([
-        ("system", """You are a job search expert. Your task is to optimize the given job search parameters
+_QUERY_OPTIMIZATION_SYSTEM_PROMPT = """You are a job search expert. Your task is to optimize the given job search parameters
         into an effective search query. Follow these guidelines:
 
         1. Use site: operator to target specific job boards:
@@ -68,7 +93,15 @@ def _get_query_optimization_prompt() -> ChatPromptTemplate:
            - Company career pages
 
         Example format:
-        (site:linkedin.com/jobs OR site:indeed.com) "software engineer" (senior OR lead) -intern -contractor "apply now" posted:7d"""),
+        (site:linkedin.com/jobs OR site:indeed.com) "software engineer" (senior OR lead) -intern -contractor "apply now" posted:7d"""
+
+
+def _get_query_optimization_prompt() -> ChatPromptTemplate:
+    """Get the prompt template for query optimization.
+    Can be overridden by specific providers to customize the prompt.
+    """
+    return ChatPromptTemplate.from_messages([
+        ("system", _QUERY_OPTIMIZATION_SYSTEM_PROMPT),
         ("user", """Job Title: {job_title}
         Location: {location}
         Company: {company}
@@ -86,21 +119,59 @@ def _get_query_optimization_prompt() -> ChatPromptTemplate:
     ])
 
 
+def _get_batch_query_optimization_prompt() -> ChatPromptTemplate:
+    """Get the prompt template for optimizing several searches in one call"""
+    return ChatPromptTemplate.from_messages([
+        ("system", _QUERY_OPTIMIZATION_SYSTEM_PROMPT + """
+
+        You will receive several numbered sets of job search parameters.
+        Return a JSON object of the form {{"queries": ["...", "..."]}} with exactly one
+        optimized query per set, in the same order."""),
+        ("user", "{searches}")
+    ])
+
+
+def _prompt_params(request: JobSearchRequest) -> Dict[str, str]:
+    """Map a request onto the variables of the query optimization prompt"""
+    return dict(
+        job_title=request.job_title or "",
+        location=request.location or "",
+        company=request.company or "",
+        job_type=request.job_type or "",
+        experience=request.experience_level or "",
+        salary=request.salary_range or "",
+        remote="remote" if request.remote else "",
+        posted_within=request.posted_within or ""
+    )
+
+
+def _query_cache_key(prompt_params: Dict[str, str]) -> str:
+    """Content hash of every parameter that reaches the prompt"""
+    params = repr(sorted(prompt_params.items())).encode()
+    return hashlib.blake2b(params, digest_size=16).hexdigest()
+
+
 class BaseJobSearchService(BaseSearchService):
     """Abstract base class for job search services"""
 
-    def __init__(self, llm_model: str = "gpt-4", temperature: float = 0):
+    def __init__(
+        self,
+        llm_model: str = "gpt-4",
+        temperature: float = 0,
+        fast_llm_model: str = "gpt-4o-mini"
+    ):
         """Initialize the base job search service
 
         Args:
-            llm_model: The LLM model to use for query optimization
+            llm_model: The LLM model to use for query optimization of complex requests
             temperature: The temperature setting for the LLM
+            fast_llm_model: The cheaper LLM model used for simple requests
         """
-        self.llm = ChatOpenAI(
-            model=llm_model,
-            temperature=temperature
-        )
-        self._query_cache: Dict[str, str] = {}
+        # Chat models are shared process-wide, so providers reuse one connection pool
+        self.llm = get_chat_model(llm_model, temperature)
+        self.fast_llm = get_chat_model(fast_llm_model, temperature)
+        self._query_cache: OrderedDict[str, str] = OrderedDict()
+        self._query_locks: Dict[str, asyncio.Lock] = {}
 
     async def optimize_search_query(self, request: JobSearchRequest) -> str:
         """
@@ -113,33 +184,126 @@ class BaseJobSearchService(BaseSearchService):
         Returns:
             Optimized search query string
         """
-        # Check cache first
-        cache_key = f"{request.job_title}:{request.location}:{request.company}"
+        # Check cache first. The key covers every parameter that reaches the prompt
+        prompt_params = _prompt_params(request)
+        cache_key = _query_cache_key(prompt_params)
         if cache_key in self._query_cache:
+            self._query_cache.move_to_end(cache_key)
             return self._query_cache[cache_key]
 
+        # Concurrent identical requests wait for the first one instead of each calling
+        # the LLM
+        lock = self._query_locks.setdefault(cache_key, asyncio.Lock())
+        try:
+            async with lock:
+                if cache_key in self._query_cache:
+                    return self._query_cache[cache_key]
+                optimized_query = await self._generate_search_query(prompt_params)
+                self._cache_query(cache_key, optimized_query)
+        finally:
+            # Dropped even when the LLM call fails, so failed keys don't pile up
+            self._query_locks.pop(cache_key, None)
+        return optimized_query
+
+    async def optimize_search_queries(
+        self, requests: List[JobSearchRequest]
+    ) -> List[str]:
+        """
+        Optimize several search queries, sending every uncached request to the LLM in
+        one call. The long system prompt is paid once for the whole batch instead of
+        once per request.
+
+        Args:
+            requests: JobSearchRequests containing job search parameters
+
+        Returns:
+            Optimized search query strings, in the same order as the requests
+        """
+        all_params = [_prompt_params(request) for request in requests]
+        keys = [_query_cache_key(params) for params in all_params]
+
+        queries: Dict[str, str] = {}
+        pending: Dict[str, Dict[str, str]] = {}
+        for key, params in zip(keys, all_params):
+            if key in self._query_cache:
+                self._query_cache.move_to_end(key)
+                queries[key] = self._query_cache[key]
+            else:
+                pending[key] = params
+
+        if len(pending) > 1:
+            try:
+                generated = await self._generate_search_queries(
+                    list(pending.values())
+                )
+                for key, optimized_query in zip(pending, generated):
+                    queries[key] = optimized_query
+                    self._cache_query(key, optimized_query)
+                pending.clear()
+            except Exception:
+                # Malformed batch reply; fall back to one call per request below
+                pass
+
+        if pending:
+            singles = await asyncio.gather(*[
+                self.optimize_search_query(requests[keys.index(key)]) for key in pending
+            ])
+            queries.update(zip(pending, singles))
+
+        return [queries[key] for key in keys]
+
+    def _cache_query(self, cache_key: str, optimized_query: str) -> None:
+        self._query_cache[cache_key] = optimized_query
+        if len(self._query_cache) > QUERY_CACHE_SIZE:
+            self._query_cache.popitem(last=False)
+
+    def _pick_llm(self, prompt_params: Dict[str, str]) -> ChatOpenAI:
+        """
+        Route a query rewrite to the fast model unless it combines several
+        constraints. Rewriting a title and location is simple; juggling salary,
+        experience, company and recency at once is where the stronger model earns
+        its cost.
+        """
+        constraints = sum(
+            bool(prompt_params[name])
+            for name in ("salary", "experience", "company", "posted_within")
+        )
+        return self.llm if constraints >= 3 else self.fast_llm
+
+    async def _generate_search_query(self, prompt_params: Dict[str, str]) -> str:
+        """Ask the LLM for an optimized search query"""
         # Get provider-specific prompt template
         prompt = _get_query_optimization_prompt()
 
         # Format the prompt with the request parameters
-        formatted_prompt = prompt.format_messages(
-            job_title=request.job_title or "",
-            location=request.location or "",
-            company=request.company or "",
-            job_type=request.job_type or "",
-            experience=request.experience_level or "",
-            salary=request.salary_range or "",
-            remote="remote" if request.remote else "",
-            posted_within=request.posted_within or ""
-        )
+        formatted_prompt = prompt.format_messages(**prompt_params)
 
         # Get optimized query from LLM
-        response = await self.llm.agenerate([formatted_prompt])
-        optimized_query = response.generations[0][0].text.strip()
-
-        # Cache the result
-        self._query_cache[cache_key] = optimized_query
-        return optimized_query
+        response = await self._pick_llm(prompt_params).agenerate([formatted_prompt])
+        return response.generations[0][0].text.strip()
+
+    async def _generate_search_queries(
+        self, all_params: List[Dict[str, str]]
+    ) -> List[str]:
+        """Ask the LLM for one optimized search query per parameter set in one call"""
+        searches = "\n\n".join(
+            f"Search {i}:\n"
+            + "\n".join(f"{name}: {value}" for name, value in params.items())
+            for i, params in enumerate(all_params, 1)
+        )
+        prompt = _get_batch_query_optimization_prompt()
+        formatted_prompt = prompt.format_messages(searches=searches)
+
+        # One complex request in the batch is enough to need the stronger model
+        needs_llm = any(self._pick_llm(params) is self.llm for params in all_params)
+        llm = self.llm if needs_llm else self.fast_llm
+        response = await llm.agenerate([formatted_prompt])
+        queries = orjson.loads(response.generations[0][0].text)["queries"]
+        if len(queries) != len(all_params):
+            raise ValueError(
+                f"Expected {len(all_params)} optimized queries, got {len(queries)}"
+            )
+        return [str(query).strip() for query in queries]
 
     @abstractmethod
     async def extract_application_url(self, search_result: SearchResult) -> str:
@@ -1,10 +1,66 @@
 from typing import List, Dict, Any, Optional
+import asyncio
 import re
+from functools import lru_cache
 from langchain_community.utilities import GoogleSearchAPIWrapper
 from ...config.settings import get_settings
-from ..base.job_search_service import BaseJobSearchService, JobSearchRequest, JobSearchResult
+from ..base.job_search_service import (
+    APPLICATION_URL_RE,
+    BaseJobSearchService,
+    JobSearchRequest,
+    JobSearchResult,
+)
 from ..base.search_service import SearchResult
 
+# Common patterns in job listing titles, in priority order
+# Example: "Software Engineer - Google Careers"
+# Example: "Data Scientist at Microsoft"
+# Compiled with re rather than RE2: RE2's \s and character classes are ASCII-only,
+# so titles and snippets with non-breaking spaces would stop matching
+_COMPANY_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'(.+?)\s+at\s+(.+?)(?:\s|$)',  # "Job Title at Company"
+    r'(.+?)\s*[-|]\s*(.+?)\s+(?:careers|jobs|hiring)',  # "Job Title - Company Careers"
+    r'(.+?)\s+\((.+?)\)',  # "Job Title (Company)"
+)]
+
+# Common location patterns in job listings, in priority order
+_LOCATION_PATTERNS = [re.compile(pattern, re.IGNORECASE) for pattern in (
+    r'location\s*:?\s*([^\.]+)',
+    r'in\s+([A-Za-z\s,]+(?:, [A-Z]{2}))',
+    r'(?:remote|onsite|hybrid)\s+in\s+([^\.]+)',
+    r'([A-Za-z\s]+(?:, [A-Z]{2}))'
+)]
+
+
+@lru_cache(maxsize=1024)
+def _parse_job_and_company(title: str) -> tuple[str, str]:
+
+    # Try to extract from title first
+    for pattern in _COMPANY_PATTERNS:
+        match = pattern.search(title)
+        if match:
+            return match.group(1).strip(), match.group(2).strip()
+
+    # If we couldn't extract from title, use a simpler approach
+    # Assume the first part of the title is the job title
+    parts = title.split(' - ', 1)
+    if len(parts) > 1:
+        return parts[0].strip(), parts[1].strip()
+
+    # If we still can't extract, return the title as job title and unknown for company
+    return title, "Unknown Company"
+
+
+@lru_cache(maxsize=1024)
+def _parse_location(snippet: str) -> str:
+
+    for pattern in _LOCATION_PATTERNS:
+        match = pattern.search(snippet)
+        if match:
+            return match.group(1).strip()
+
+    return "Unknown Location"
+
 class GoogleJobSearchService(BaseJobSearchService):
 
     def __init__(self, llm_model: str = "gpt-4", temperature: float = 0):
@@ -23,18 +79,15 @@ class GoogleJobSearchService(BaseJobSearchService):
         return "Google Search API"
 
     async def extract_application_url(self, search_result: SearchResult) -> str:
+        return self._application_url(search_result)
+
+    def _application_url(self, search_result: SearchResult) -> str:
 
         # The link from Google search is usually the most direct one
         application_url = search_result.link
 
         # Check if the URL is likely a job application URL
-        application_patterns = [
-            r'apply', r'application', r'job', r'career', r'position',
-            r'greenhouse\.io', r'lever\.co', r'workday\.com', r'taleo\.net',
-            r'linkedin\.com\/jobs', r'indeed\.com\/viewjob', r'glassdoor\.com\/job'
-        ]
-
-        is_application_url = any(re.search(pattern, application_url, re.IGNORECASE) for pattern in application_patterns)
+        is_application_url = APPLICATION_URL_RE.search(application_url) is not None
 
         if not is_application_url:
             # Could implement additional logic here to find a more direct application URL
@@ -44,9 +97,14 @@ class GoogleJobSearchService(BaseJobSearchService):
         return application_url
 
     async def convert_to_job_search_result(self, search_result: SearchResult) -> JobSearchResult:
+        return self._to_job_search_result(search_result)
+
+    def _to_job_search_result(self, search_result: SearchResult) -> JobSearchResult:
+        # Conversion is pure string work, so it runs synchronously instead of
+        # awaiting once per result
 
         # Extract application URL
-        application_url = await self.extract_application_url(search_result)
+        application_url = self._application_url(search_result)
 
         # Extract job details from title and snippet
         job_title, company_name = self._extract_job_and_company(search_result.title, search_result.snippet)
@@ -68,86 +126,46 @@ class GoogleJobSearchService(BaseJobSearchService):
             job_description=search_result.snippet
         )
 
+    @staticmethod
+    def _to_search_result(position: int, result: Dict[str, Any]) -> SearchResult:
+        get = result.get
+        return SearchResult(
+            title=get("title", ""),
+            link=get("link", ""),
+            snippet=get("snippet", ""),
+            source=get("source", ""),
+            metadata={
+                "position": position,
+                "html_snippet": get("htmlSnippet", ""),
+                "mime_type": get("mime", ""),
+                "file_format": get("fileFormat", ""),
+                "image": get("image", {}),
+                "additional_links": get("additional_links", [])
+            }
+        )
+
     async def search(self, request: JobSearchRequest) -> List[JobSearchResult]:
 
         # Optimize the search query using LLM
         optimized_query = await self.optimize_search_query(request)
 
         # Perform the search using Google Search API
-        raw_results = self.search_api.results(optimized_query, num_results=request.num_results)
-
-        # Convert raw results to SearchResult objects
-        search_results = [
-            SearchResult(
-                title=result.get("title", ""),
-                link=result.get("link", ""),
-                snippet=result.get("snippet", ""),
-                source=result.get("source", ""),
-                metadata={
-                    "position": i,
-                    "html_snippet": result.get("htmlSnippet", ""),
-                    "mime_type": result.get("mime", ""),
-                    "file_format": result.get("fileFormat", ""),
-                    "image": result.get("image", {}),
-                    "additional_links": result.get("additional_links", [])
-                }
-            )
+        # The API wrapper is a blocking client, so run it on the worker pool
+        raw_results = await asyncio.to_thread(
+            self.search_api.results, optimized_query, num_results=request.num_results
+        )
+
+        # Convert each raw result to a SearchResult, then a JobSearchResult, in one pass
+        return [
+            self._to_job_search_result(self._to_search_result(i, result))
             for i, result in enumerate(raw_results)
         ]
 
-        # Process each search result to extract job details and application URL
-        job_results = []
-        for result in search_results:
-            # Convert to JobSearchResult using the standardized method
-            job_result = await self.convert_to_job_search_result(result)
-            job_results.append(job_result)
-
-        return job_results
-
     def _extract_job_and_company(self, title: str, snippet: str) -> tuple[str, str]:
-
-        # Common patterns in job listing titles
-        # Example: "Software Engineer - Google Careers"
-        # Example: "Data Scientist at Microsoft"
-
-        # Try to extract from title first
-        company_patterns = [
-            r'(.+?)\s+at\s+(.+?)(?:\s|$)',  # "Job Title at Company"
-            r'(.+?)\s*[-|]\s*(.+?)\s+(?:careers|jobs|hiring)',  # "Job Title - Company Careers"
-            r'(.+?)\s+\((.+?)\)',  # "Job Title (Company)"
-        ]
-
-        for pattern in company_patterns:
-            match = re.search(pattern, title, re.IGNORECASE)
-            if match:
-                return match.group(1).strip(), match.group(2).strip()
-
-        # If we couldn't extract from title, use a simpler approach
-        # Assume the first part of the title is the job title
-        parts = title.split(' - ', 1)
-        if len(parts) > 1:
-            return parts[0].strip(), parts[1].strip()
-
-        # If we still can't extract, return the title as job title and unknown for company
-        return title, "Unknown Company"
+        return _parse_job_and_company(title)
 
     def _extract_location(self, snippet: str) -> str:
-
-        # Common location patterns in job listings
-        location_patterns = [
-            r'location\s*:?\s*([^\.]+)',
-            r'in\s+([A-Za-z\s,]+(?:, [A-Z]{2}))',
-            r'(?:remote|onsite|hybrid)\s+in\s+([^\.]+)',
-            r'([A-Za-z\s]+(?:, [A-Z]{2}))'
-        ]
-
-
-        for pattern in location_patterns:
-            match = re.search(pattern, snippet, re.IGNORECASE)
-            if match:
-                return match.group(1).strip()
-
-        return "Unknown Location"
+        return _parse_location(snippet)
 
     async def cleanup(self) -> None:
         """Cleanup any resources used by the search service"""
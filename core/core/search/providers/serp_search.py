@@ -1,13 +1,55 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, AsyncIterator, Optional, Set, Tuple
+import asyncio
+import logging
 import re
-from langchain_community.utilities import SerpAPIWrapper
+import time
+from collections import OrderedDict
+import ijson
+import orjson
 from ...config.settings import get_settings
-from ..base.job_search_service import BaseJobSearchService, JobSearchRequest, JobSearchResult
+from ...scraping.base import get_http_session
+from ..base.job_search_service import (
+    APPLICATION_URL_RE,
+    BaseJobSearchService,
+    JobSearchRequest,
+    JobSearchResult,
+)
 from ..base.search_service import SearchResult, SearchRequest
 
+logger = logging.getLogger(__name__)
+
+SERPAPI_SEARCH_URL = "https://serpapi.com/search"
+SERPAPI_ARCHIVE_URL = "https://serpapi.com/searches"
+
+# Keyword scans over lowercased SerpAPI extensions. These strings are a few words
+# long, where one re alternation beats both a generator of `in` checks and RE2
+_JOB_TYPE_RE = re.compile(r'full-time|part-time|contract|temporary|internship')
+_POSTED_DATE_RE = re.compile(r'day|week|month|hour|minute|ago')
+
+# ijson prefixes of the individual results in a SerpAPI response body
+_RESULT_PREFIXES = frozenset({'jobs_results.item', 'organic_results.item'})
+
+# Identical searches are answered from memory for a while instead of paying SerpAPI
+RESULTS_CACHE_TTL = 10 * 60  # seconds
+RESULTS_CACHE_SIZE = 1024
+
+# Most SerpAPI calls in flight at once when running several searches together
+MAX_CONCURRENT_SEARCHES = 50
+
+# Batches with more distinct queries than this are submitted with async=true and
+# collected from the search archive, so no connection is held open while SerpAPI works
+ASYNC_SEARCH_THRESHOLD = MAX_CONCURRENT_SEARCHES
+ASYNC_POLL_INITIAL_DELAY = 1.0  # seconds, doubled after every pending poll
+ASYNC_POLL_MAX_DELAY = 8.0
+ASYNC_POLL_TIMEOUT = 120.0
+
+def _raw_results(body: Dict[str, Any]) -> List[Dict[str, Any]]:
+    """Results of a complete SerpAPI response, falling back to organic results"""
+    return body.get("jobs_results") or body.get("organic_results", [])
+
 class SerpSearchService(BaseJobSearchService):
     """
-    Job search service using SerpAPI via LangChain.
+    Job search service using SerpAPI over the shared aiohttp session.
     This provides comprehensive search results but may be more expensive than Google Search API.
 
     Requires:
@@ -24,16 +66,22 @@ class SerpSearchService(BaseJobSearchService):
         super().__init__(llm_model, temperature)
         settings = get_settings()
 
-        # Initialize SerpAPI wrapper
-        self.search_api = SerpAPIWrapper(
-            serpapi_api_key=settings.serpapi_key,
-            search_engine="google",  # Use Google as the search engine
-            params={
-                "engine": "google_jobs",  # Specifically target Google Jobs
-                "gl": "us",  # Geo-location, can be configured based on user preferences
-                "hl": "en"   # Language
-            }
-        )
+        # Fixed SerpAPI parameters sent with every search
+        self.search_params = {
+            "api_key": settings.serpapi_key,
+            "engine": "google_jobs",  # Specifically target Google Jobs
+            "gl": "us",  # Geo-location, can be configured based on user preferences
+            "hl": "en"   # Language
+        }
+
+        # (optimized query, num_results) -> (fetched at, raw results)
+        self._results_cache: OrderedDict[
+            Tuple[str, int], Tuple[float, List[Dict[str, Any]]]
+        ] = OrderedDict()
+        # In-flight searches; resolves to the raw results or the search's error, or to
+        # None if the search was abandoned or a prefetch failed and waiters should
+        # search themselves
+        self._inflight: Dict[Tuple[str, int], asyncio.Future] = {}
 
     @property
     def provider_name(self) -> str:
@@ -48,15 +96,8 @@ class SerpSearchService(BaseJobSearchService):
         # If no direct application link is found, use the main link
         application_url = search_result.link
 
-        # Check if the URL is likely a job application URL
-        application_patterns = [
-            r'apply', r'application', r'job', r'career', r'position',
-            r'greenhouse\.io', r'lever\.co', r'workday\.com', r'taleo\.net',
-            r'linkedin\.com\/jobs', r'indeed\.com\/viewjob', r'glassdoor\.com\/job'
-        ]
-
         # If the URL doesn't match any application patterns, it might not be a direct application URL
-        is_application_url = any(re.search(pattern, application_url, re.IGNORECASE) for pattern in application_patterns)
+        is_application_url = APPLICATION_URL_RE.search(application_url) is not None
 
         if not is_application_url:
             # Could implement additional logic here to find a more direct application URL
@@ -85,22 +126,24 @@ class SerpSearchService(BaseJobSearchService):
             # Extract job type
             job_type = None
             extensions = result.get("extensions", [])
-            for ext in extensions:
-                if any(jt in ext.lower() for jt in ["full-time", "part-time", "contract", "temporary", "internship"]):
+            # Lowercase each extension once for all three scans below
+            lowered_extensions = [(ext, ext.lower()) for ext in extensions]
+            for ext, ext_lower in lowered_extensions:
+                if _JOB_TYPE_RE.search(ext_lower):
                     job_type = ext
                     break
 
             # Extract salary range
             salary_range = None
-            for ext in extensions:
-                if "$" in ext or "salary" in ext.lower():
+            for ext, ext_lower in lowered_extensions:
+                if "$" in ext or "salary" in ext_lower:
                     salary_range = ext
                     break
 
             # Extract posted date
             posted_date = None
-            for ext in extensions:
-                if any(time_unit in ext.lower() for time_unit in ["day", "week", "month", "hour", "minute", "ago"]):
+            for ext, ext_lower in lowered_extensions:
+                if _POSTED_DATE_RE.search(ext_lower):
                     posted_date = ext
                     break
 
@@ -155,30 +198,246 @@ class SerpSearchService(BaseJobSearchService):
         Returns:
             List of JobSearchResult objects with direct application URLs
         """
+        return [result async for result in self.search_stream(request)]
+
+    async def search_stream(
+        self, request: JobSearchRequest
+    ) -> AsyncIterator[JobSearchResult]:
+        """
+        Perform a job search using SerpAPI, yielding results as they are parsed
+
+        Args:
+            request: JobSearchRequest object containing job search parameters
+
+        Yields:
+            JobSearchResult objects with direct application URLs, the first one
+            as soon as its JSON has arrived rather than after the whole payload
+        """
         # Optimize the search query using LLM
         optimized_query = await self.optimize_search_query(request)
+        results = self._search_optimized(optimized_query, request.num_results)
+        async for result in results:
+            yield result
 
-        # Perform the search using SerpAPI
-        raw_results = self.search_api.results(optimized_query, num_results=request.num_results)
+    async def search_many(
+        self, requests: List[JobSearchRequest]
+    ) -> List[List[JobSearchResult]]:
+        """
+        Perform several job searches concurrently
 
-        # SerpAPI returns results in a different format depending on the engine
-        # For google_jobs, the results are in the "jobs_results" key
-        job_results = raw_results.get("jobs_results", [])
+        The queries are optimized in a single LLM call, then up to
+        MAX_CONCURRENT_SEARCHES SerpAPI calls run at once over the shared session.
 
-        if not job_results and "organic_results" in raw_results:
-            # Fall back to organic results if no job results
-            job_results = raw_results.get("organic_results", [])
+        Args:
+            requests: JobSearchRequest objects containing job search parameters
 
-        # Convert raw results to JobSearchResult objects
-        processed_results = []
-        for result in job_results:
-            # Convert to JobSearchResult using the standardized method
-            job_result = await self.convert_to_job_search_result(result)
-            processed_results.append(job_result)
+        Returns:
+            One list of JobSearchResult objects per request, in the same order
+        """
+        optimized_queries = await self.optimize_search_queries(requests)
+        slots = asyncio.Semaphore(MAX_CONCURRENT_SEARCHES)
+
+        keys = {
+            (query, request.num_results)
+            for query, request in zip(optimized_queries, requests)
+        }
+        if len(keys) > ASYNC_SEARCH_THRESHOLD:
+            # Fill the cache from SerpAPI's async mode; anything that fails falls back
+            # to a regular search below
+            await self._prefetch_async(keys, slots)
+
+        async def run(optimized_query: str, num_results: int) -> List[JobSearchResult]:
+            async with slots:
+                results = self._search_optimized(optimized_query, num_results)
+                return [result async for result in results]
+
+        return list(await asyncio.gather(*(
+            run(query, request.num_results)
+            for query, request in zip(optimized_queries, requests)
+        )))
+
+    async def _search_optimized(
+        self, optimized_query: str, num_results: int
+    ) -> AsyncIterator[JobSearchResult]:
+        """Search SerpAPI for an already optimized query, yielding results as parsed"""
+        # Reuse a recent or in-flight search for the same query instead of calling
+        # SerpAPI again
+        key = (optimized_query, num_results)
+        raw_results = await self._shared_results(key)
+        if raw_results is not None:
+            for result in raw_results:
+                yield await self.convert_to_job_search_result(result)
+            return
+
+        # Perform the search using SerpAPI, letting identical searches wait on this one
+        # (core.coalesce.coalesced's protocol, inlined so results stream as parsed)
+        inflight = asyncio.get_running_loop().create_future()
+        self._inflight[key] = inflight
+        raw_results = []
+        try:
+            async for result in self._stream_results(optimized_query, num_results):
+                raw_results.append(result)
+                yield await self.convert_to_job_search_result(result)
+            self._cache_results(key, raw_results)
+            inflight.set_result(raw_results)
+        except Exception as e:
+            inflight.set_exception(e)
+            inflight.exception()
+            raise
+        finally:
+            if not inflight.done():
+                inflight.set_result(None)
+            del self._inflight[key]
+
+    async def _prefetch_async(
+        self, keys: Set[Tuple[str, int]], slots: asyncio.Semaphore
+    ) -> None:
+        """Run the uncached searches in `keys` through SerpAPI's async mode"""
+        loop = asyncio.get_running_loop()
+        pending = {
+            key: loop.create_future()
+            for key in keys
+            if self._cached_results(key) is None and key not in self._inflight
+        }
+        self._inflight.update(pending)
+
+        async def prefetch(key: Tuple[str, int], inflight: asyncio.Future) -> None:
+            try:
+                async with slots:
+                    search_id = await self._submit_async_search(key[0])
+                raw_results = await self._poll_async_search(search_id, slots)
+                raw_results = raw_results[:key[1]]
+                self._cache_results(key, raw_results)
+                inflight.set_result(raw_results)
+            except Exception:
+                # The search falls back to a regular request, but the failure should
+                # still show up
+                logger.warning(
+                    f"SerpAPI async prefetch failed for query: {key[0]}", exc_info=True
+                )
+            finally:
+                if not inflight.done():
+                    inflight.set_result(None)
+                del self._inflight[key]
+
+        await asyncio.gather(
+            *(prefetch(key, inflight) for key, inflight in pending.items())
+        )
 
-        return processed_results
+    async def _submit_async_search(self, query: str) -> str:
+        """Queue a search with async=true and return its search id without waiting"""
+        params = {**self.search_params, "q": query, "async": "true"}
+        session = get_http_session()
+        async with session.get(SERPAPI_SEARCH_URL, params=params) as response:
+            response.raise_for_status()
+            return orjson.loads(await response.read())["search_metadata"]["id"]
+
+    async def _poll_async_search(
+        self, search_id: str, slots: asyncio.Semaphore
+    ) -> List[Dict[str, Any]]:
+        """Poll the search archive, backing off exponentially, until a search is done"""
+        url = f"{SERPAPI_ARCHIVE_URL}/{search_id}.json"
+        params = {"api_key": self.search_params["api_key"]}
+        delay = ASYNC_POLL_INITIAL_DELAY
+        deadline = time.monotonic() + ASYNC_POLL_TIMEOUT
+        while True:
+            await asyncio.sleep(delay)
+            async with slots:
+                async with get_http_session().get(url, params=params) as response:
+                    response.raise_for_status()
+                    body = orjson.loads(await response.read())
+            status = body.get("search_metadata", {}).get("status")
+            if status == "Success":
+                return _raw_results(body)
+            if status == "Error" or time.monotonic() + delay > deadline:
+                raise Exception(
+                    f"SerpAPI search {search_id} did not complete: "
+                    f"{body.get('error', status)}"
+                )
+            delay = min(delay * 2, ASYNC_POLL_MAX_DELAY)
+
+    def _cached_results(self, key: Tuple[str, int]) -> Optional[List[Dict[str, Any]]]:
+        """Return unexpired cached raw results for `key`, refreshing its LRU position"""
+        cached = self._results_cache.get(key)
+        if cached and time.monotonic() - cached[0] < RESULTS_CACHE_TTL:
+            self._results_cache.move_to_end(key)
+            return cached[1]
+        return None
+
+    async def _shared_results(
+        self, key: Tuple[str, int]
+    ) -> Optional[List[Dict[str, Any]]]:
+        """
+        Return cached raw results for `key`, waiting for an in-flight search if any
+
+        Raises the in-flight search's error if it failed.
+        """
+        while True:
+            cached = self._cached_results(key)
+            if cached is not None:
+                return cached
+            inflight = self._inflight.get(key)
+            if inflight is None:
+                return None
+            raw_results = await asyncio.shield(inflight)
+            if raw_results is not None:
+                return raw_results
+
+    def _cache_results(
+        self, key: Tuple[str, int], raw_results: List[Dict[str, Any]]
+    ) -> None:
+        """Store raw results, evicting the least recently used entry over the cap"""
+        self._results_cache[key] = (time.monotonic(), raw_results)
+        self._results_cache.move_to_end(key)
+        if len(self._results_cache) > RESULTS_CACHE_SIZE:
+            self._results_cache.popitem(last=False)
+
+    async def _stream_results(
+        self, query: str, num_results: int
+    ) -> AsyncIterator[Dict[str, Any]]:
+        """
+        Call the SerpAPI search endpoint and parse the body incrementally
+
+        For google_jobs the results are in the "jobs_results" key; those are
+        yielded as soon as each one is complete. "organic_results" are only a
+        fallback, so they are held back until the body shows there are no job
+        results. Connections are pooled with the scrapers.
+
+        google_jobs has no result count parameter, so at most `num_results`
+        results are taken from the page here.
+        """
+        params = {**self.search_params, "q": query}
+        session = get_http_session()
+        async with session.get(SERPAPI_SEARCH_URL, params=params) as response:
+            response.raise_for_status()
+            found_jobs = False
+            organic_results = []
+            builder = None
+            events = ijson.parse_async(response.content, use_float=True)
+            async for prefix, event, value in events:
+                if builder is None:
+                    starts_item = event in ('start_map', 'start_array')
+                    if starts_item and prefix in _RESULT_PREFIXES:
+                        builder = ijson.ObjectBuilder()
+                        item_prefix = prefix
+                        builder.event(event, value)
+                    continue
+                builder.event(event, value)
+                if prefix == item_prefix and event in ('end_map', 'end_array'):
+                    if item_prefix == 'jobs_results.item':
+                        found_jobs = True
+                        yield builder.value
+                        num_results -= 1
+                        if num_results <= 0:
+                            return
+                    else:
+                        organic_results.append(builder.value)
+                    builder = None
+            if not found_jobs:
+                for result in organic_results[:num_results]:
+                    yield result
 
     async def cleanup(self) -> None:
         """Cleanup any resources used by the search service"""
-        # No specific cleanup needed for SerpAPI
-        pass
+        # The shared HTTP session is closed at app shutdown
+        self._results_cache.clear()
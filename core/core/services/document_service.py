@@ -1,59 +1,159 @@
-from typing import Dict, Any, Optional, List
+from typing import (
+    Dict, Any, Optional, List, AsyncIterator, Awaitable, BinaryIO, Callable, FrozenSet
+)
 import os
 from fastapi import UploadFile
-from ..config.settings import get_settings
 import aiofiles
+import time
 import uuid
 from datetime import datetime
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 import magic
-import aiofiles.os
 from pathlib import Path
 from ..models.document_models import DocumentType, DocumentInfo, DocumentListResponse
+from ..errors import wrap_errors
+
+# MIME types accepted for stored documents, as detected by libmagic
+_ALLOWED_MIME_TYPES = frozenset({
+    "application/pdf",
+    "application/msword",
+    "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    "text/plain"
+})
+
+# Container formats libmagic may report from the first bytes alone (a legacy .doc
+# is often just "OLE storage") -> the allowed types they can hold. Such a sniff is
+# settled by the upload's declared content type or extension
+_AMBIGUOUS_MIME_TYPES = {
+    "application/x-ole-storage": frozenset({"application/msword"}),
+    "application/CDFV2": frozenset({"application/msword"}),
+    "application/vnd.ms-office": frozenset({"application/msword"}),
+    "application/zip": frozenset({
+        "application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+    })
+}
+
+_MIME_TYPE_BY_EXTENSION = {
+    ".pdf": "application/pdf",
+    ".doc": "application/msword",
+    ".docx": "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
+    ".txt": "text/plain"
+}
+
+# libmagic identifies every allowed type, or at least its container, from the start
+# of the file
+_SNIFF_BYTES = 8 * 1024
+
+# Stored names are "{type}_{unix time}_{random}{ext}" (older uploads used other
+# suffixes after the type). Types may themselves contain underscores, so a name is
+# matched against the type prefixes, longest first, rather than split
+_DOC_TYPE_PREFIXES = sorted(
+    ((f"{doc_type.value}_", doc_type) for doc_type in DocumentType),
+    key=lambda prefix: len(prefix[0]),
+    reverse=True
+)
+
+def _document_type(filename: str) -> Optional[DocumentType]:
+    """Document type encoded in a stored filename, or None if it has none"""
+    for prefix, doc_type in _DOC_TYPE_PREFIXES:
+        if filename.startswith(prefix):
+            return doc_type
+    return None
 
 class DocumentService:
     def __init__(self):
-        self.settings = get_settings()
         self.upload_dir = os.path.join(os.getcwd(), "uploads")
         self._ensure_upload_dir()
-        self.chunk_size = 1024 * 1024  # 1MB chunks
+        self.chunk_size = 4 * 1024 * 1024  # 4MB chunks
         self.max_file_size = 10 * 1024 * 1024  # 10MB limit
-        self._thread_pool = ThreadPoolExecutor(max_workers=4)
+        # Loading the magic database is expensive, so do it once per service
+        self._magic = magic.Magic(mime=True)
 
     def _ensure_upload_dir(self):
         """Ensure the upload directory exists"""
         if not os.path.exists(self.upload_dir):
             os.makedirs(self.upload_dir)
 
-    async def _validate_file_type(self, file_path: str) -> bool:
-        """Validate file type using python-magic"""
+    def _validate_file_type(self, head: bytes, claimed_types: FrozenSet[str]) -> bool:
+        """
+        Validate file type from its leading bytes using python-magic
+
+        A sniff that only identifies a container format passes when the type
+        claimed for the upload fits in that container.
+        """
         try:
-            mime = magic.Magic(mime=True)
-            file_type = mime.from_file(file_path)
-            allowed_types = {
-                "application/pdf",
-                "application/msword",
-                "application/vnd.openxmlformats-officedocument.wordprocessingml.document",
-                "text/plain"
-            }
-            return file_type in allowed_types
+            detected = self._magic.from_buffer(head)
         except Exception:
             return False
+        if detected in _ALLOWED_MIME_TYPES:
+            return True
+        container_types = _AMBIGUOUS_MIME_TYPES.get(detected, frozenset())
+        return not container_types.isdisjoint(claimed_types)
+
+    @staticmethod
+    def _claimed_types(
+        filename: Optional[str], content_type: Optional[str]
+    ) -> FrozenSet[str]:
+        """Types an upload claims through its declared content type and its extension"""
+        extension = os.path.splitext(filename or "")[1].lower()
+        extension_type = _MIME_TYPE_BY_EXTENSION.get(extension)
+        return frozenset(filter(None, (content_type, extension_type)))
+
+    def _copy_upload(
+        self, src: BinaryIO, file_path: str, claimed_types: FrozenSet[str]
+    ) -> int:
+        """
+        Copy a spooled upload to disk in one blocking pass
 
-    async def _stream_file(self, file: UploadFile, file_path: str) -> int:
-        """Stream file content in chunks"""
+        Runs in a worker thread, so the whole copy costs a single hop instead
+        of two awaits per chunk.
+        """
         total_size = 0
+        src.seek(0)
+        with open(file_path, 'wb') as out_file:
+            chunk = src.read(_SNIFF_BYTES)
+            if not self._validate_file_type(chunk, claimed_types):
+                raise ValueError("Invalid file type")
+            while chunk:
+                if total_size + len(chunk) > self.max_file_size:
+                    raise ValueError("File size exceeds maximum limit")
+                out_file.write(chunk)
+                total_size += len(chunk)
+                chunk = src.read(self.chunk_size)
+        return total_size
+
+    async def _stream_chunks(
+        self,
+        chunks: AsyncIterator[bytes],
+        file_path: str,
+        claimed_types: FrozenSet[str]
+    ) -> int:
+        """
+        Stream chunks to disk
+
+        The file type is sniffed from the first bytes as they arrive, so an
+        invalid upload is rejected before the rest of it is written.
+        """
+        total_size = 0
+        head = bytearray()
         async with aiofiles.open(file_path, 'wb') as out_file:
-            while True:
-                chunk = await file.read(self.chunk_size)
+            async for chunk in chunks:
                 if not chunk:
-                    break
+                    continue
                 if total_size + len(chunk) > self.max_file_size:
-                    await aiofiles.os.remove(file_path)
                     raise ValueError("File size exceeds maximum limit")
+                if head is not None:
+                    head += chunk[:_SNIFF_BYTES - len(head)]
+                    if len(head) >= _SNIFF_BYTES:
+                        if not self._validate_file_type(bytes(head), claimed_types):
+                            raise ValueError("Invalid file type")
+                        head = None
                 await out_file.write(chunk)
                 total_size += len(chunk)
+        # Files shorter than the sniff window are checked once fully read
+        if head is not None:
+            if not self._validate_file_type(bytes(head), claimed_types):
+                raise ValueError("Invalid file type")
         return total_size
 
     async def save_document(self, file: UploadFile, document_type: DocumentType) -> DocumentInfo:
@@ -67,101 +167,142 @@ class DocumentService:
         Returns:
             DocumentInfo containing file information
         """
+        return await self._save(
+            lambda file_path: asyncio.to_thread(
+                self._copy_upload, file.file, file_path,
+                self._claimed_types(file.filename, file.content_type)
+            ),
+            file.filename, file.content_type, document_type
+        )
+
+    async def save_document_stream(
+        self,
+        stream: AsyncIterator[bytes],
+        content_type: str,
+        document_type: DocumentType,
+        filename: str
+    ) -> DocumentInfo:
+        """
+        Save a document straight from a raw request body stream
+
+        Args:
+            stream: Async iterator over the body chunks (e.g. request.stream())
+            content_type: Content type declared by the client
+            document_type: Type of document (resume/cover_letter)
+            filename: Original filename supplied by the client
+
+        Returns:
+            DocumentInfo containing file information
+        """
+        return await self._save(
+            lambda file_path: self._stream_chunks(
+                stream, file_path, self._claimed_types(filename, content_type)
+            ),
+            filename, content_type, document_type
+        )
+
+    async def _save(
+        self,
+        write: Callable[[str], Awaitable[int]],
+        original_filename: str,
+        content_type: str,
+        document_type: DocumentType
+    ) -> DocumentInfo:
+        """Write content to a uniquely named file with `write` and describe it"""
         try:
             # Generate unique filename
-            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-            unique_id = str(uuid.uuid4())[:8]
-            file_extension = os.path.splitext(file.filename)[1]
-            new_filename = f"{document_type.value}_{timestamp}_{unique_id}{file_extension}"
+            file_extension = os.path.splitext(original_filename)[1]
+            # The random part keeps names unique across restarts and replicas sharing
+            # a volume
+            new_filename = (
+                f"{document_type.value}_{int(time.time())}_{uuid.uuid4().hex[:12]}"
+                f"{file_extension}"
+            )
             file_path = os.path.join(self.upload_dir, new_filename)
 
-            # Stream file content
-            total_size = await self._stream_file(file, file_path)
-
-            # Validate file type
-            if not await self._validate_file_type(file_path):
-                await aiofiles.os.remove(file_path)
-                raise ValueError("Invalid file type")
+            # Stream file content, validating its type on the way
+            total_size = await write(file_path)
 
             return DocumentInfo(
                 filename=new_filename,
-                original_filename=file.filename,
+                original_filename=original_filename,
                 file_path=file_path,
                 document_type=document_type,
                 size=total_size,
-                content_type=file.content_type
+                content_type=content_type
             )
         except Exception as e:
             # Cleanup on error
             if 'file_path' in locals():
                 try:
-                    await aiofiles.os.remove(file_path)
+                    await asyncio.to_thread(os.remove, file_path)
                 except:
                     pass
-            raise Exception(f"Error saving document: {str(e)}")
+            raise Exception(f"Error saving document: {str(e)}") from e
+
+    def _stat_document(self, file_path: str) -> Optional[os.stat_result]:
+        """Stat a stored document, returning None when it does not exist"""
+        try:
+            return os.stat(file_path)
+        except FileNotFoundError:
+            return None
 
+    def _remove_document(self, file_path: str) -> bool:
+        """Remove a stored document, returning False when it does not exist"""
+        try:
+            os.remove(file_path)
+            return True
+        except FileNotFoundError:
+            return False
+
+    @wrap_errors("Error retrieving document")
     async def get_document(self, filename: str) -> Optional[DocumentInfo]:
         """
         Get document information with async file operations
         """
-        try:
-            file_path = os.path.join(self.upload_dir, filename)
-            if not await aiofiles.os.path.exists(file_path):
-                return None
+        file_path = os.path.join(self.upload_dir, filename)
+        # A single stat both checks existence and fetches the metadata
+        stats = await asyncio.to_thread(self._stat_document, file_path)
+        if stats is None:
+            return None
 
-            # Get file stats asynchronously
-            stats = await aiofiles.os.stat(file_path)
+        # Extract document type from filename, defaulting to resume if it has none
+        document_type = _document_type(filename) or DocumentType.RESUME
 
-            # Extract document type from filename
-            doc_type = filename.split('_')[0]
-            try:
-                document_type = DocumentType(doc_type)
-            except ValueError:
-                document_type = DocumentType.RESUME  # Default to resume if type is invalid
-
-            return DocumentInfo(
-                filename=filename,
-                original_filename=filename,
-                file_path=file_path,
-                document_type=document_type,
-                size=stats.st_size,
-                content_type="application/octet-stream",  # Default content type
-                last_modified=datetime.fromtimestamp(stats.st_mtime)
-            )
-        except Exception as e:
-            raise Exception(f"Error retrieving document: {str(e)}")
+        return DocumentInfo(
+            filename=filename,
+            original_filename=filename,
+            file_path=file_path,
+            document_type=document_type,
+            size=stats.st_size,
+            content_type="application/octet-stream",  # Default content type
+            last_modified=datetime.fromtimestamp(stats.st_mtime)
+        )
 
+    @wrap_errors("Error deleting document")
     async def delete_document(self, filename: str) -> bool:
         """
         Delete a document with async operations
         """
-        try:
-            file_path = os.path.join(self.upload_dir, filename)
-            if await aiofiles.os.path.exists(file_path):
-                await aiofiles.os.remove(file_path)
-                return True
-            return False
-        except Exception as e:
-            raise Exception(f"Error deleting document: {str(e)}")
+        file_path = os.path.join(self.upload_dir, filename)
+        return await asyncio.to_thread(self._remove_document, file_path)
 
-    async def list_documents(self, document_type: Optional[DocumentType] = None) -> DocumentListResponse:
-        """
-        List all documents with optional filtering by type
-        """
-        try:
-            documents = []
-            async for entry in aiofiles.os.scandir(self.upload_dir):
+    def _scan_documents(
+        self, document_type: Optional[DocumentType]
+    ) -> List[DocumentInfo]:
+        """Scan the upload directory and stat every matching file in one pass"""
+        documents = []
+        with os.scandir(self.upload_dir) as entries:
+            for entry in entries:
                 if entry.is_file():
                     # Extract document type from filename
-                    doc_type = entry.name.split('_')[0]
-                    try:
-                        file_doc_type = DocumentType(doc_type)
-                        if document_type and file_doc_type != document_type:
-                            continue
-                    except ValueError:
+                    file_doc_type = _document_type(entry.name)
+                    if file_doc_type is None:
                         continue  # Skip files with invalid document types
+                    if document_type and file_doc_type != document_type:
+                        continue
 
-                    stats = await aiofiles.os.stat(entry.path)
+                    stats = entry.stat()
                     documents.append(
                         DocumentInfo(
                             filename=entry.name,
@@ -173,15 +314,24 @@ class DocumentService:
                             last_modified=datetime.fromtimestamp(stats.st_mtime)
                         )
                     )
-            return DocumentListResponse(
-                documents=documents,
-                total_count=len(documents),
-                document_type=document_type
-            )
-        except Exception as e:
-            raise Exception(f"Error listing documents: {str(e)}")
+        return documents
+
+    @wrap_errors("Error listing documents")
+    async def list_documents(
+        self, document_type: Optional[DocumentType] = None
+    ) -> DocumentListResponse:
+        """
+        List all documents with optional filtering by type
+        """
+        # One worker-thread hop for the whole scan rather than one per stat call
+        documents = await asyncio.to_thread(self._scan_documents, document_type)
+        return DocumentListResponse(
+            documents=documents,
+            total_count=len(documents),
+            document_type=document_type
+        )
 
     async def cleanup(self):
         """Cleanup resources"""
-        if self._thread_pool:
-            self._thread_pool.shutdown(wait=True)
\ No newline at end of file
+        # Blocking work runs on the app's default executor, which main.py shuts down
+        pass
\ No newline at end of file
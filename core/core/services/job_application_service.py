@@ -1,71 +1,384 @@
-from typing import Dict, Any
-from langchain.chat_models import ChatOpenAI
-from langchain.prompts import ChatPromptTemplate
-from langchain.chains import LLMChain
-from ..models.application_models import JobAnalysis, ApplicationResponse
+from typing import Dict, Any, List, Optional, Tuple, Union
+import asyncio
+import hashlib
+import time
+from collections import OrderedDict
+from ..models.application_models import (
+    FormFields, FormFieldsBatch, JobAnalysis, ApplicationResponse
+)
 from ..config.settings import get_settings
+from ..config.llm import get_openai_client
+from ..coalesce import coalesced
+from ..errors import wrap_errors
 from ..scraping import JobScrappingService, FormScrapingService
 
+# System prompt for identifying form fields from a job posting
+_FORM_FIELDS_SYSTEM_PROMPT = (
+    "You are an expert at analyzing job postings and identifying required "
+    "application form fields.\n"
+    "Analyze the job posting and identify ONLY the form fields that an applicant "
+    "needs to fill out.\n"
+    "Report them with the report_form_fields function, keyed by form field name.\n"
+    "Do not include any predefined fields or assumptions. Only include fields "
+    "explicitly mentioned in the job posting."
+)
+
+# Function the model must call; its arguments are validated against FormFields
+_FORM_FIELDS_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "report_form_fields",
+        "description": "Report the application form fields found in the job posting",
+        "parameters": FormFields.model_json_schema()
+    }
+}
+
+# Several postings analyzed in one completion, sharing the system prompt
+_FORM_FIELDS_BATCH_SYSTEM_PROMPT = (
+    "You are an expert at analyzing job postings and identifying required "
+    "application form fields.\n"
+    "You will be given several numbered job postings. For each one, identify ONLY "
+    "the form fields that an applicant needs to fill out.\n"
+    "Report them with the report_form_fields_batch function: one entry per posting, "
+    "in the order given, keyed by form field name.\n"
+    "Do not include any predefined fields or assumptions. Only include fields "
+    "explicitly mentioned in each job posting."
+)
+
+_FORM_FIELDS_BATCH_TOOL = {
+    "type": "function",
+    "function": {
+        "name": "report_form_fields_batch",
+        "description": "Report the application form fields found in each job posting",
+        "parameters": FormFieldsBatch.model_json_schema()
+    }
+}
+
+# Postings per batched completion; job content is capped at 32K characters each,
+# so this stays well inside the model's context window
+FORM_FIELDS_BATCH_SIZE = 8
+
+# Scraped postings are reused for repeat analyses of the same URL for a while
+SCRAPE_CACHE_TTL = 10 * 60  # seconds
+SCRAPE_CACHE_SIZE = 128
+
+# Form fields identified by the LLM, keyed on a digest of the posting content
+FORM_FIELDS_CACHE_SIZE = 256
+
+
 class JobAnalysisService:
     def __init__(self):
         self.settings = get_settings()
-        self.llm = ChatOpenAI(
-            model="gpt-4-turbo-preview",
-            api_key=self.settings.OPENAI_API_KEY
-        )
-        self.job_scraper = JobScrappingService()
-        self.form_scraper = FormScrapingService()
-        self._setup_chains()
-
-    def _setup_chains(self):
-        # Chain for identifying form fields from job posting
-        form_fields_prompt = ChatPromptTemplate.from_messages([
-            ("system", """You are an expert at analyzing job postings and identifying required application form fields.
-            Analyze the job posting and identify ONLY the form fields that an applicant needs to fill out.
-            Return a JSON object where each key is a form field name and the value is an object with:
-            - required: boolean indicating if the field is mandatory
-            - field_type: type of input needed (text, number, date, select, etc.)
-            - description: brief description of what should go in this field
-            Do not include any predefined fields or assumptions. Only include fields explicitly mentioned in the job posting."""),
-            ("user", "Content: {content}\n\nIdentify the required application form fields.")
-        ])
-        self.form_fields_chain = LLMChain(llm=self.llm, prompt=form_fields_prompt)
+        self.model = "gpt-4-turbo-preview"
+        self.client = get_openai_client()
+        self.job_scraper = JobScrappingService(self.settings)
+        self.form_scraper = FormScrapingService(self.settings)
+        # job_url -> (scraped at, job data, form data or the form scraping error)
+        self._scrape_cache: OrderedDict[
+            str, Tuple[float, Dict[str, Any], Any]
+        ] = OrderedDict()
+        # content digest -> identified form fields
+        self._form_fields_cache: OrderedDict[str, Dict[str, Any]] = OrderedDict()
+        # job_url -> result or error of the analysis or scrape currently running for it
+        self._analyses_inflight: Dict[str, asyncio.Future] = {}
+        self._scrapes_inflight: Dict[str, asyncio.Future] = {}
+        # Caps concurrent completions so batched analyses stay inside OpenAI rate limits
+        self._llm_slots = asyncio.Semaphore(self.settings.MAX_CONCURRENT_LLM)
 
     async def identify_form_fields(self, content: str) -> Dict[str, Any]:
         """Use LLM to identify required form fields from job posting"""
+        # Identical content always gets the same answer, so skip the LLM on a repeat
+        cache_key = self._form_fields_key(content)
+        cached = self._cached_form_fields(cache_key)
+        if cached is not None:
+            return cached
+
+        try:
+            async with self._llm_slots:
+                completion = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": _FORM_FIELDS_SYSTEM_PROMPT},
+                        {
+                            "role": "user",
+                            "content": f"Content: {content}\n\n"
+                                       "Identify the required application form fields."
+                        }
+                    ],
+                    # Force a structured reply that matches the FormFields schema
+                    tools=[_FORM_FIELDS_TOOL],
+                    tool_choice={
+                        "type": "function",
+                        "function": {"name": "report_form_fields"}
+                    }
+                )
+            arguments = completion.choices[0].message.tool_calls[0].function.arguments
+            form_fields = FormFields.model_validate_json(arguments)
+            fields = {
+                name: field.model_dump() for name, field in form_fields.fields.items()
+            }
+        except Exception as e:
+            raise Exception(f"Error identifying form fields: {str(e)}") from e
+
+        self._cache_form_fields(cache_key, fields)
+        return fields
+
+    async def identify_form_fields_batch(
+        self, contents: List[str]
+    ) -> List[Union[Dict[str, Any], Exception]]:
+        """
+        Use LLM to identify form fields for several job postings
+
+        Uncached postings are sent FORM_FIELDS_BATCH_SIZE at a time, so the
+        system prompt and round trip are paid once per batch, not per posting.
+        Each batch is cached as soon as it succeeds; the postings of a failed
+        batch are retried one at a time.
+
+        Returns:
+            Form fields for each posting, in the order of `contents`, or the
+            exception raised while identifying them
+        """
+        keys = [self._form_fields_key(content) for content in contents]
+        results: Dict[str, Union[Dict[str, Any], Exception]] = {}
+        pending: Dict[str, str] = {}
+        for key, content in zip(keys, contents):
+            cached = self._cached_form_fields(key)
+            if cached is not None:
+                results[key] = cached
+            else:
+                pending[key] = content
+
+        pending_keys = list(pending)
+        batches = [
+            pending_keys[i:i + FORM_FIELDS_BATCH_SIZE]
+            for i in range(0, len(pending_keys), FORM_FIELDS_BATCH_SIZE)
+        ]
+        outcomes = await asyncio.gather(
+            *(self._identify_cached_batch(batch, pending) for batch in batches),
+            return_exceptions=True
+        )
+
+        failed: List[str] = []
+        for batch, outcome in zip(batches, outcomes):
+            if not isinstance(outcome, BaseException):
+                results.update(zip(batch, outcome))
+            elif len(batch) == 1:
+                # Already a single-posting call, so retrying would only repeat it
+                results[batch[0]] = outcome
+            else:
+                failed.extend(batch)
+
+        retried = await asyncio.gather(
+            *(self.identify_form_fields(pending[key]) for key in failed),
+            return_exceptions=True
+        )
+        results.update(zip(failed, retried))
+        return [results[key] for key in keys]
+
+    async def _identify_cached_batch(
+        self, batch: List[str], pending: Dict[str, str]
+    ) -> List[Dict[str, Any]]:
+        """Identify form fields for one batch of postings and cache them"""
+        batch_fields = await self._identify_batch([pending[key] for key in batch])
+        for key, fields in zip(batch, batch_fields):
+            self._cache_form_fields(key, fields)
+        return batch_fields
+
+    async def _identify_batch(self, contents: List[str]) -> List[Dict[str, Any]]:
+        """Identify form fields for one batch of postings in a single completion"""
+        if len(contents) == 1:
+            return [await self.identify_form_fields(contents[0])]
+
+        postings = "\n\n".join(
+            f"Job posting {number}:\n{content}"
+            for number, content in enumerate(contents, 1)
+        )
         try:
-            return await self.form_fields_chain.arun(content=content)
+            async with self._llm_slots:
+                completion = await self.client.chat.completions.create(
+                    model=self.model,
+                    messages=[
+                        {"role": "system", "content": _FORM_FIELDS_BATCH_SYSTEM_PROMPT},
+                        {
+                            "role": "user",
+                            "content": f"{postings}\n\nIdentify the required "
+                                       "application form fields of each job posting."
+                        }
+                    ],
+                    tools=[_FORM_FIELDS_BATCH_TOOL],
+                    tool_choice={
+                        "type": "function",
+                        "function": {"name": "report_form_fields_batch"}
+                    }
+                )
+            arguments = completion.choices[0].message.tool_calls[0].function.arguments
+            batch = FormFieldsBatch.model_validate_json(arguments)
+            if len(batch.postings) != len(contents):
+                raise ValueError(
+                    f"expected {len(contents)} postings, got {len(batch.postings)}"
+                )
         except Exception as e:
-            raise Exception(f"Error identifying form fields: {str(e)}")
+            raise Exception(f"Error identifying form fields: {str(e)}") from e
+        return [
+            {name: field.model_dump() for name, field in form_fields.fields.items()}
+            for form_fields in batch.postings
+        ]
+
+    @staticmethod
+    def _form_fields_key(content: str) -> str:
+        return hashlib.blake2b(content.encode(), digest_size=16).hexdigest()
+
+    def _cached_form_fields(self, cache_key: str) -> Optional[Dict[str, Any]]:
+        fields = self._form_fields_cache.get(cache_key)
+        if fields is not None:
+            self._form_fields_cache.move_to_end(cache_key)
+        return fields
+
+    def _cache_form_fields(self, cache_key: str, fields: Dict[str, Any]) -> None:
+        self._form_fields_cache[cache_key] = fields
+        if len(self._form_fields_cache) > FORM_FIELDS_CACHE_SIZE:
+            self._form_fields_cache.popitem(last=False)
+
+    async def _scrape_posting(self, job_url: str) -> Tuple[Dict[str, Any], Any]:
+        """Scrape a posting's content and form, reusing a recent or in-flight scrape"""
+        cached = self._scrape_cache.get(job_url)
+        if cached and time.monotonic() - cached[0] < SCRAPE_CACHE_TTL:
+            self._scrape_cache.move_to_end(job_url)
+            return cached[1], cached[2]
+        return await coalesced(
+            self._scrapes_inflight, job_url, lambda: self._fetch_posting(job_url)
+        )
+
+    async def _fetch_posting(self, job_url: str) -> Tuple[Dict[str, Any], Any]:
+        """Scrape a posting's content and form into the scrape cache"""
+        # Both scrapers read the same page, so download it once
+        try:
+            final_url, html = await self.job_scraper.fetch(job_url)
+        except Exception as e:
+            raise Exception(f"Error scraping job posting: {str(e)}") from e
+
+        # Scrape job posting content and, if available, the actual form fields
+        job_data, form_data = await asyncio.gather(
+            self.job_scraper.scrape_page(final_url, html),
+            self.form_scraper.scrape_page(final_url, html),
+            return_exceptions=True
+        )
+        if isinstance(job_data, BaseException):
+            raise job_data
+
+        self._scrape_cache[job_url] = (time.monotonic(), job_data, form_data)
+        self._scrape_cache.move_to_end(job_url)
+        if len(self._scrape_cache) > SCRAPE_CACHE_SIZE:
+            self._scrape_cache.popitem(last=False)
+        return job_data, form_data
+
+    @staticmethod
+    def _scraped_form_fields(form_data: Any) -> Optional[Dict[str, Any]]:
+        """
+        Form fields found by the form scraper, or None if it failed
+
+        A page without a form yields `{}`, which is returned as is.
+        """
+        if isinstance(form_data, BaseException):
+            return None
+        try:
+            return form_data["form_fields"]
+        except Exception:
+            return None
+
+    @staticmethod
+    def _analysis_response(
+        job_url: str, form_fields: Dict[str, Any]
+    ) -> ApplicationResponse:
+        # Create analysis with URL and form fields
+        analysis = JobAnalysis(
+            url=job_url,
+            form_fields=form_fields
+        )
+
+        return ApplicationResponse(
+            analysis=analysis,
+            success=True,
+            message="Job posting analyzed successfully"
+        )
 
     async def analyze_job_posting(self, job_url: str) -> ApplicationResponse:
         """Analyze a job posting and identify form fields"""
+        # Concurrent requests for the same posting share one scrape and LLM call
+        return await coalesced(
+            self._analyses_inflight, job_url, lambda: self._analyze_posting(job_url)
+        )
+
+    @wrap_errors("Error analyzing job posting")
+    async def _analyze_posting(self, job_url: str) -> ApplicationResponse:
+        job_data, form_data = await self._scrape_posting(job_url)
+
+        form_fields = self._scraped_form_fields(form_data)
+        if form_fields is None:
+            # If form scraping fails, use LLM to identify fields
+            form_fields = await self.identify_form_fields(job_data["content"])
+
+        return self._analysis_response(job_url, form_fields)
+
+    async def analyze_job_postings(
+        self, job_urls: List[str]
+    ) -> List[Union[ApplicationResponse, Exception]]:
+        """
+        Analyze several job postings concurrently
+
+        Scraping is already bounded by the scraper's request slots and LLM calls
+        by MAX_CONCURRENT_LLM, so N postings take about as long as the slowest
+        one rather than the sum of all of them. Postings without a scrapable
+        form share batched LLM calls.
+
+        Returns:
+            One ApplicationResponse per URL, in order, or the exception raised
+            while analyzing that posting
+        """
+        scraped = await asyncio.gather(
+            *(self._scrape_posting(job_url) for job_url in job_urls),
+            return_exceptions=True
+        )
+
+        results: List[Union[ApplicationResponse, Exception, None]] = (
+            [None] * len(job_urls)
+        )
+        needs_llm: Dict[int, str] = {}
+        for index, (job_url, posting) in enumerate(zip(job_urls, scraped)):
+            if isinstance(posting, BaseException):
+                results[index] = Exception(
+                    f"Error analyzing job posting: {str(posting)}"
+                )
+                continue
+            job_data, form_data = posting
+            form_fields = self._scraped_form_fields(form_data)
+            if form_fields is None:
+                needs_llm[index] = job_data["content"]
+            else:
+                results[index] = self._try_analysis_response(job_url, form_fields)
+
+        if needs_llm:
+            identified = await self.identify_form_fields_batch(list(needs_llm.values()))
+            for index, form_fields in zip(needs_llm, identified):
+                if isinstance(form_fields, BaseException):
+                    results[index] = Exception(
+                        f"Error analyzing job posting: {str(form_fields)}"
+                    )
+                else:
+                    results[index] = self._try_analysis_response(
+                        job_urls[index], form_fields
+                    )
+        return results
+
+    def _try_analysis_response(
+        self, job_url: str, form_fields: Dict[str, Any]
+    ) -> Union[ApplicationResponse, Exception]:
         try:
-            # Scrape job posting content
-            job_data = await self.job_scraper.scrape(job_url)
-
-            # Try to scrape actual form fields if available
-            try:
-                form_data = await self.form_scraper.scrape(job_url)
-                form_fields = form_data["form_fields"]
-            except:
-                # If form scraping fails, use LLM to identify fields
-                form_fields = await self.identify_form_fields(job_data["content"])
-
-            # Create analysis with URL and form fields
-            analysis = JobAnalysis(
-                url=job_url,
-                form_fields=form_fields
-            )
-
-            return ApplicationResponse(
-                analysis=analysis,
-                success=True,
-                message="Job posting analyzed successfully"
-            )
+            return self._analysis_response(job_url, form_fields)
         except Exception as e:
-            raise Exception(f"Error analyzing job posting: {str(e)}")
+            return Exception(f"Error analyzing job posting: {str(e)}")
 
     async def cleanup(self):
         """Cleanup resources"""
+        # The shared OpenAI client is closed at app shutdown
         pass
\ No newline at end of file
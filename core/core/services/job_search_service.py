@@ -1,16 +1,72 @@
 from typing import List, Optional, Dict, Any, Type, Tuple, Callable
+from collections import OrderedDict
 from functools import lru_cache
+import asyncio
+import hashlib
 import logging
+import time
+import numpy as np
+from openai import AsyncOpenAI
+from ..coalesce import coalesced
+from ..config.llm import get_openai_client
 from ..models.job_models import JobResult, JobSearchRequest, JobSearchResponse
 from ..search.base.job_search_service import BaseJobSearchService, JobSearchRequest as BaseJobSearchRequest
 from ..search.providers.serp_search import SerpSearchService
 from ..search.providers.google_search import GoogleJobSearchService
 from ..search.base.search_service import SearchRequest
-from ..config.settings import get_settings
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
+# A cached response is reused for a differently worded query whose embedding is
+# at least this similar, provided the location, job type, experience level and
+# result count match exactly
+SEMANTIC_CACHE_THRESHOLD = 0.92
+EMBEDDING_MODEL = "text-embedding-3-small"
+
+# Job listings go stale, so cached responses expire; the LRU cap bounds memory
+RESULT_CACHE_TTL = 60 * 60  # seconds
+RESULT_CACHE_SIZE = 2048
+
+# Rows first allocated for a filter set's embedding matrix; it doubles when full
+SEMANTIC_INDEX_INITIAL_ROWS = 16
+
+
+def _normalize(text: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so trivially different inputs compare equal"""
+    return " ".join(text.lower().split()) if text else ""
+
+
+@lru_cache(maxsize=4096)
+def _build_search_query(
+    query: str,
+    location: Optional[str],
+    job_type: Optional[str],
+    experience_level: Optional[str]
+) -> str:
+    """Build the provider query; memoized since the same searches recur often"""
+    # Start with the base query, adding the "jobs" keyword if it isn't already in it
+    query_lower = query.lower()
+    if "job" in query_lower or "career" in query_lower:
+        query_parts = [query]
+    else:
+        query_parts = [query, "jobs"]
+
+    # Add location if provided
+    if location:
+        query_parts.append(f"in {location}")
+
+    # Add job type if provided
+    if job_type:
+        query_parts.append(job_type)
+
+    # Add experience level if provided
+    if experience_level:
+        query_parts.append(experience_level)
+
+    # Join all parts with spaces
+    return " ".join(query_parts)
+
 
 class JobSearchError(Exception):
     """Base exception for job search errors"""
@@ -70,10 +126,22 @@ class JobSearchService:
 
         Raises:
             ProviderNotFoundError: If the specified provider is not found
+
+        The provider itself is built on first use, so app startup does not pay
+        for its API clients and chat models.
         """
-        self.settings = get_settings()
         self.provider_name = provider.lower()
-        self._result_cache = {}
+        # cache key -> (cached at, response, semantic index filters key or None)
+        self._result_cache: OrderedDict[
+            str, Tuple[float, JobSearchResponse, Optional[Tuple]]
+        ] = OrderedDict()
+        # Exact filters -> (unit embeddings of cached queries, their result cache keys).
+        # The matrix has spare rows; only the first len(cache keys) are in use
+        self._semantic_index: Dict[Tuple, Tuple[np.ndarray, List[str]]] = {}
+        # cache key -> response or error of the search currently running for it
+        self._inflight: Dict[str, asyncio.Future] = {}
+        # Embedding client for the semantic cache, created by the first lookup
+        self._embedding_client: Optional[AsyncOpenAI] = None
 
         # Get provider configuration
         provider_config = self.PROVIDERS.get(self.provider_name)
@@ -84,16 +152,35 @@ class JobSearchService:
             )
 
         # Merge default params with provided params
-        provider_class = provider_config["class"]
-        params = {**provider_config["default_params"], **provider_params}
+        self._provider_class: Type[BaseJobSearchService] = provider_config["class"]
+        self._provider_params = {**provider_config["default_params"], **provider_params}
+        self._search_service: Optional[BaseJobSearchService] = None
 
-        # Initialize the selected provider
-        try:
-            self.search_service = provider_class(**params)
-            logger.info(f"Initialized job search service with provider: {self.provider_name}")
-        except Exception as e:
-            logger.error(f"Failed to initialize provider {self.provider_name}: {str(e)}")
-            raise ProviderNotFoundError(f"Failed to initialize provider {self.provider_name}: {str(e)}")
+    @property
+    def search_service(self) -> BaseJobSearchService:
+        """
+        The selected provider, initialized on first access
+
+        Construction is synchronous, so concurrent first searches on the event
+        loop cannot build it twice.
+
+        Raises:
+            ProviderNotFoundError: If the provider fails to initialize
+        """
+        if self._search_service is None:
+            try:
+                self._search_service = self._provider_class(**self._provider_params)
+                logger.info(
+                    "Initialized job search service with provider: "
+                    f"{self.provider_name}"
+                )
+            except Exception as e:
+                message = (
+                    f"Failed to initialize provider {self.provider_name}: {str(e)}"
+                )
+                logger.error(message)
+                raise ProviderNotFoundError(message) from e
+        return self._search_service
 
     def _construct_search_query(self, request: JobSearchRequest) -> str:
         """
@@ -105,27 +192,12 @@ class JobSearchService:
         Returns:
             Optimized search query string
         """
-        # Start with the base query
-        query_parts = [request.query]
-
-        # Add "jobs" keyword if not already in the query
-        if "job" not in request.query.lower() and "career" not in request.query.lower():
-            query_parts.append("jobs")
-
-        # Add location if provided
-        if request.location:
-            query_parts.append(f"in {request.location}")
-
-        # Add job type if provided
-        if request.job_type:
-            query_parts.append(request.job_type)
-
-        # Add experience level if provided
-        if request.experience_level:
-            query_parts.append(request.experience_level)
-
-        # Join all parts with spaces
-        return " ".join(query_parts)
+        return _build_search_query(
+            request.query,
+            request.location,
+            request.job_type,
+            request.experience_level
+        )
 
     def _get_cache_key(self, request: JobSearchRequest) -> str:
         """
@@ -137,8 +209,135 @@ class JobSearchService:
         Returns:
             Cache key string
         """
-        # Create a cache key based on provider and request parameters
-        return f"{self.provider_name}:{request.query}:{request.location}:{request.job_type}:{request.experience_level}:{request.num_results}"
+        # Create a cache key based on provider and request parameters. Free text is
+        # normalized so "Python Developer" and "python  developer" share an entry, and
+        # the fields are hashed into a short fixed-length key
+        key = "\x1f".join((
+            self.provider_name,
+            _normalize(request.query),
+            _normalize(request.location),
+            _normalize(request.job_type),
+            _normalize(request.experience_level),
+            str(request.num_results)
+        ))
+        return hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+
+    def _get_filters_key(self, request: JobSearchRequest) -> Tuple:
+        """Parameters that must match exactly for a semantic cache hit"""
+        return (
+            _normalize(request.location),
+            _normalize(request.job_type),
+            _normalize(request.experience_level),
+            request.num_results
+        )
+
+    async def _embed_query(self, query: str) -> Optional[np.ndarray]:
+        """
+        Embed a normalized query for the semantic cache
+
+        Returns:
+            Unit-length embedding, or None if the embedding call failed
+        """
+        try:
+            if self._embedding_client is None or self._embedding_client.is_closed():
+                # A cache lookup should never hold up a search for long, so fail fast
+                # instead of retrying
+                self._embedding_client = get_openai_client().with_options(
+                    max_retries=0, timeout=5.0
+                )
+            response = await self._embedding_client.embeddings.create(
+                model=EMBEDDING_MODEL,
+                input=_normalize(query)
+            )
+        except Exception as e:
+            logger.warning(f"Skipping semantic cache, embedding failed: {str(e)}")
+            return None
+        embedding = np.asarray(response.data[0].embedding, dtype=np.float32)
+        return embedding / np.linalg.norm(embedding)
+
+    def _find_similar(
+        self, request: JobSearchRequest, embedding: np.ndarray
+    ) -> Optional[str]:
+        """Return the cache key of the most similar cached query with equal filters"""
+        entry = self._semantic_index.get(self._get_filters_key(request))
+        if entry is None:
+            return None
+        embeddings, cache_keys = entry
+        similarities = embeddings[:len(cache_keys)] @ embedding
+        best = int(np.argmax(similarities))
+        if similarities[best] < SEMANTIC_CACHE_THRESHOLD:
+            return None
+        return cache_keys[best]
+
+    def _index_query(
+        self, filters_key: Tuple, embedding: np.ndarray, cache_key: str
+    ) -> None:
+        """Add a cached query's embedding to the semantic index"""
+        entry = self._semantic_index.get(filters_key)
+        if entry is None:
+            rows = np.empty(
+                (SEMANTIC_INDEX_INITIAL_ROWS, embedding.shape[0]), dtype=np.float32
+            )
+            entry = (rows, [])
+            self._semantic_index[filters_key] = entry
+        embeddings, cache_keys = entry
+        if len(cache_keys) == len(embeddings):
+            # Grow geometrically so appends don't copy the whole matrix every time
+            embeddings = np.concatenate((embeddings, np.empty_like(embeddings)))
+            self._semantic_index[filters_key] = (embeddings, cache_keys)
+        embeddings[len(cache_keys)] = embedding
+        cache_keys.append(cache_key)
+
+    def _unindex_query(self, filters_key: Tuple, cache_key: str) -> None:
+        """Drop an evicted query's embedding from the semantic index"""
+        embeddings, cache_keys = self._semantic_index[filters_key]
+        if len(cache_keys) == 1:
+            del self._semantic_index[filters_key]
+            return
+        # Move the last row into the freed slot instead of shifting every row after it
+        row = cache_keys.index(cache_key)
+        last = len(cache_keys) - 1
+        embeddings[row] = embeddings[last]
+        cache_keys[row] = cache_keys[last]
+        cache_keys.pop()
+
+    def _get_cached(self, cache_key: str) -> Optional[JobSearchResponse]:
+        """Return a cached response that has not expired, refreshing its LRU position"""
+        entry = self._result_cache.get(cache_key)
+        if entry is None:
+            return None
+        if time.monotonic() - entry[0] >= RESULT_CACHE_TTL:
+            self._evict(cache_key)
+            return None
+        self._result_cache.move_to_end(cache_key)
+        return entry[1]
+
+    def _cache_response(
+        self,
+        cache_key: str,
+        response: JobSearchResponse,
+        filters_key: Optional[Tuple] = None,
+        cached_at: Optional[float] = None
+    ) -> None:
+        """
+        Cache a response, evicting the least recently used entry once over the cap
+
+        `cached_at` backdates the entry, so an alias of an older response
+        expires together with it.
+        """
+        if cache_key in self._result_cache:
+            # Concurrent identical searches finish one after another; keep one index row
+            self._evict(cache_key)
+        cached_at = time.monotonic() if cached_at is None else cached_at
+        self._result_cache[cache_key] = (cached_at, response, filters_key)
+        if len(self._result_cache) > RESULT_CACHE_SIZE:
+            self._evict(next(iter(self._result_cache)))
+
+    def _evict(self, cache_key: str) -> None:
+        """Remove a cached response along with its semantic index entry"""
+        _, _, filters_key = self._result_cache.pop(cache_key)
+        if filters_key is not None:
+            self._unindex_query(filters_key, cache_key)
 
     def _convert_to_job_result(self, result) -> JobResult:
         """
@@ -150,6 +349,8 @@ class JobSearchService:
         Returns:
             JobResult object
         """
+        # Validated construction on purpose: for six flat str fields pydantic-core's
+        # validator is about twice as fast as model_construct's Python-level field loop
         return JobResult(
             title=result.job_title,
             link=result.application_url,
@@ -170,14 +371,40 @@ class JobSearchService:
             JobSearchResponse with search results
 
         Raises:
+            ProviderNotFoundError: If the provider fails to initialize
             SearchExecutionError: If there's an error executing the search
         """
         # Check cache first
         cache_key = self._get_cache_key(request)
-        if cache_key in self._result_cache:
+        response = self._get_cached(cache_key)
+        if response is not None:
             logger.info(f"Cache hit for query: {request.query}")
-            return self._result_cache[cache_key]
+            return response
+
+        # Identical searches already running are shared instead of calling the provider
+        return await coalesced(
+            self._inflight, cache_key, lambda: self._search_uncached(request, cache_key)
+        )
 
+    async def _search_uncached(
+        self, request: JobSearchRequest, cache_key: str
+    ) -> JobSearchResponse:
+        """Run a search that missed the exact-match cache and cache its response"""
+        # Look for a paraphrase of an earlier query with the same filters
+        embedding = await self._embed_query(request.query)
+        if embedding is not None:
+            similar_key = self._find_similar(request, embedding)
+            response = self._get_cached(similar_key) if similar_key else None
+            if response is not None:
+                logger.info(f"Semantic cache hit for query: {request.query}")
+                # Same results, but reported under the query this caller asked for
+                response = response.model_copy(update={"search_query": request.query})
+                cached_at = self._result_cache[similar_key][0]
+                self._cache_response(cache_key, response, cached_at=cached_at)
+                return response
+
+        # Resolved outside the try so initialization errors stay ProviderNotFoundError
+        search_service = self.search_service
         try:
             logger.info(f"Searching jobs with provider {self.provider_name}: {request.query}")
 
@@ -196,7 +423,7 @@ class JobSearchService:
             )
 
             # Perform search
-            search_results = await self.search_service.search(search_request)
+            search_results = await search_service.search(search_request)
 
             # Convert JobSearchResult objects to JobResult objects
             job_results = [self._convert_to_job_result(result) for result in search_results]
@@ -209,23 +436,31 @@ class JobSearchService:
             )
 
             # Cache the results
-            self._result_cache[cache_key] = response
+            if embedding is None:
+                self._cache_response(cache_key, response)
+            else:
+                filters_key = self._get_filters_key(request)
+                self._cache_response(cache_key, response, filters_key)
+                self._index_query(filters_key, embedding, cache_key)
 
             return response
 
         except Exception as e:
             logger.error(f"Error searching jobs: {str(e)}")
-            raise SearchExecutionError(f"Error searching jobs: {str(e)}")
+            raise SearchExecutionError(f"Error searching jobs: {str(e)}") from e
 
     async def clear_cache(self):
         """Clear the search results cache"""
         self._result_cache.clear()
+        self._semantic_index.clear()
         logger.info("Search results cache cleared")
 
     async def cleanup(self):
         """Cleanup resources used by the search service"""
         try:
-            await self.search_service.cleanup()
+            if self._search_service is None:
+                return
+            await self._search_service.cleanup()
             logger.info(f"Cleaned up resources for provider: {self.provider_name}")
         except Exception as e:
             logger.error(f"Error cleaning up resources: {str(e)}")